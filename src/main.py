@@ -5,7 +5,7 @@ e layout de e-mail em formato de "jornal diário".
 Funcionalidades principais:
 - Busca termos configuráveis (fiscal/tributário, incentivos etc.) em seções do DOU.
 - Foco, por padrão, na EDIÇÃO DO DIA (period: today -> exactDate=dia).
-- Envia e-mail com boletim diário de publicações relevantes, evitando duplicidades via state/seen.json.
+- Envia e-mail com boletim diário de publicações relevantes, evitando duplicidades via state/seen.txt.
 - (Opcional) Gera resumos automáticos via IA (Hugging Face Inference) para cada matéria.
 """
 
@@ -16,17 +16,24 @@ import sys
 import smtplib
 import ssl
 import asyncio
+import functools
+import threading
 import time
 import html
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 from pathlib import Path
-from urllib.parse import quote_plus
+from urllib.parse import parse_qsl, quote_plus, urlencode, urlsplit, urlunsplit
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import yaml
-from bs4 import BeautifulSoup
-from unidecode import unidecode
+import lxml.etree
+import lxml.html
+from anyascii import anyascii
 from tenacity import retry, wait_fixed, stop_after_attempt
 from playwright.async_api import async_playwright
 from huggingface_hub import InferenceClient
@@ -46,12 +53,27 @@ logger = logging.getLogger(__name__)
 # Raiz do repositório (assumindo que este arquivo está em src/main.py)
 ROOT = Path(__file__).resolve().parents[1]
 
-# Arquivo de estado (publicações já enviadas)
-STATE_FILE = ROOT / "state" / "seen.json"
+# Arquivo de estado (publicações já enviadas): uma chave por linha, só com append
+STATE_FILE = ROOT / "state" / "seen.txt"
+
+# Formato antigo do estado (lista JSON), lido apenas para migração
+LEGACY_STATE_FILE = ROOT / "state" / "seen.json"
 
 # Arquivo de configuração principal
 CONFIG_FILE = ROOT / "config.yml"
 
+# Tamanho máximo da fila entre busca (listagem) e enriquecimento
+ENRICH_QUEUE_SIZE = 20
+
+# Fuso de Brasília (datas da edição do DOU). Sem base tz no sistema, usa -03:00 fixo.
+try:
+    BR_TZ = ZoneInfo("America/Sao_Paulo")
+except ZoneInfoNotFoundError:
+    BR_TZ = timezone(timedelta(hours=-3))
+
+# Espaços em branco (qualquer sequência), usado por várias normalizações
+_RE_WS = re.compile(r"\s+")
+
 
 # ---------------------------------------------------------------------------
 # IA – resumo automático via Hugging Face
@@ -65,13 +87,48 @@ def _prepare_summary_text(full_text: str, max_chars: int) -> str:
     if not text:
         return ""
     # Colapsa espaços e quebras de linha
-    text = re.sub(r"\s+", " ", text)
+    text = _RE_WS.sub(" ", text)
     # Limita tamanho máximo
     if max_chars and len(text) > max_chars:
         text = text[:max_chars]
     return text
 
 
+# Frases claramente erradas / metalinguagem de IA
+_RE_BAD_SUMMARY = re.compile("|".join(map(re.escape, [
+    "este script",
+    "este código",
+    "como um modelo de linguagem",
+    "i am an ai",
+    "sou um modelo de linguagem",
+    "sou apenas um modelo",
+])))
+
+# Aberturas "noticiosas" comuns ("O DOU publicou...", etc.)
+_STRIP_OPENER_PATS = [
+    r"^o diário oficial da união (publicou|publica)[^,\.]*[,\.]\s*",
+    r"^o diario oficial da uniao (publicou|publica)[^,\.]*[,\.]\s*",
+    r"^o diário oficial (publicou|publica)[^,\.]*[,\.]\s*",
+    r"^o diario oficial (publicou|publica)[^,\.]*[,\.]\s*",
+    r"^a agência nacional[^,\.]* (publicou|publica)[^,\.]*[,\.]\s*",
+    r"^a agencia nacional[^,\.]* (publicou|publica)[^,\.]*[,\.]\s*",
+    r"^o ato declaratório executivo (do )?(ministério da fazenda|ministerio da fazenda|mdf|mfd)[^,\.]*[,\.]\s*",
+]
+_RE_STRIP_OPENERS = [re.compile(p, re.I) for p in _STRIP_OPENER_PATS]
+# Alternância única: uma varredura decide se alguma abertura está presente
+_RE_ANY_OPENER = re.compile("|".join(_STRIP_OPENER_PATS), re.I)
+
+# Contextualização de data típica de notícia
+_RE_NEWSY = re.compile("|".join(map(re.escape, [
+    "nesta sexta-feira",
+    "nesta quinta-feira",
+    "na última sexta-feira",
+    "na ultima sexta-feira",
+    "na data de hoje",
+    "hoje",
+])))
+
+
 def _postprocess_summary(summary: str, max_chars: int) -> str:
     """
     Limpa, normaliza e limita o resumo gerado pela IA.
@@ -88,46 +145,23 @@ def _postprocess_summary(summary: str, max_chars: int) -> str:
         return ""
 
     # Colapsa espaços e quebras de linha
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_WS.sub(" ", s).strip()
     low = s.lower()
 
     # Frases claramente erradas / metalinguagem de IA
-    bad_snippets = [
-        "este script",
-        "este código",
-        "como um modelo de linguagem",
-        "i am an ai",
-        "sou um modelo de linguagem",
-        "sou apenas um modelo",
-    ]
-    if any(bad in low for bad in bad_snippets):
+    if _RE_BAD_SUMMARY.search(low):
         return ""
 
     # Remove aberturas "noticiosas" comuns ("O DOU publicou...", etc.)
-    strip_patterns = [
-        r"(?i)^o diário oficial da união (publicou|publica)[^,\.]*[,\.]\s*",
-        r"(?i)^o diario oficial da uniao (publicou|publica)[^,\.]*[,\.]\s*",
-        r"(?i)^o diário oficial (publicou|publica)[^,\.]*[,\.]\s*",
-        r"(?i)^o diario oficial (publicou|publica)[^,\.]*[,\.]\s*",
-        r"(?i)^a agência nacional[^,\.]* (publicou|publica)[^,\.]*[,\.]\s*",
-        r"(?i)^a agencia nacional[^,\.]* (publicou|publica)[^,\.]*[,\.]\s*",
-        r"(?i)^o ato declaratório executivo (do )?(ministério da fazenda|ministerio da fazenda|mdf|mfd)[^,\.]*[,\.]\s*",
-    ]
-    for pat in strip_patterns:
-        s = re.sub(pat, "", s).strip()
+    # (aplicadas em sequência, como antes, só quando a alternância casa)
+    if _RE_ANY_OPENER.match(s):
+        for pat in _RE_STRIP_OPENERS:
+            s = pat.sub("", s).strip()
 
     low = s.lower()
 
     # Se ainda sobrou muito "notícia de jornal" pura, podemos descartar
-    newsy_snippets = [
-        "nesta sexta-feira",
-        "nesta quinta-feira",
-        "na última sexta-feira",
-        "na ultima sexta-feira",
-        "na data de hoje",
-        "hoje",
-    ]
-    if any(ns in low for ns in newsy_snippets) and "ato declaratório" not in low and "solução de consulta" not in low:
+    if _RE_NEWSY.search(low) and "ato declaratório" not in low and "solução de consulta" not in low:
         # se for só contextualização de data, sem o conteúdo, descarta
         return ""
 
@@ -149,51 +183,86 @@ def _postprocess_summary(summary: str, max_chars: int) -> str:
     return s
 
 
-def _summarize_with_gemini(text: str, ai_cfg: dict) -> str:
+# Instruções comuns aos prompts do Gemini (resumo único e em lote)
+_GEMINI_PERSONA = (
+    "Você é um analista jurídico-tributário especializado em normas publicadas "
+    "no Diário Oficial da União.\n\n"
+)
+_GEMINI_REGRAS = (
+    "- indicar, se possível, o tipo do ato (lei, decreto, portaria, instrução normativa etc.);\n"
+    "- destacar o tema central e o impacto prático para empresas, com foco em aspectos fiscais, "
+    "tributários, regulatórios ou de incentivos;\n"
+    "- mencionar tributos, benefícios ou obrigações relevantes, quando existirem;\n"
+    "- evitar repetir literalmente o título do ato;\n"
+    "- ser objetivo, técnico e sem adjetivos desnecessários.\n\n"
+)
+
+# Marcador que separa os atos (e as respostas) num prompt em lote
+_RE_ITEM_MARK = re.compile(r"===\s*ITEM\s+(\d+)\s*===")
+
+
+def _gemini_setup(ai_cfg: dict):
     """
-    Tenta gerar resumo usando Gemini (Google Generative AI).
-    Requer GEMINI_API_KEY configurado.
+    Configura o Gemini e devolve (model, temperature, max_output_tokens).
+    Devolve None se o SDK ou a GEMINI_API_KEY não estiverem disponíveis.
     """
     try:
         import google.generativeai as genai
     except ImportError:
         logger.warning("[IA] google-generativeai não está instalado; pulando Gemini.")
-        return ""
+        return None
 
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         logger.warning("[IA] GEMINI_API_KEY não definido; pulando Gemini.")
-        return ""
-
-    try:
-        genai.configure(api_key=api_key)
-    except Exception as exc:
-        logger.warning("[IA] Falha ao configurar Gemini: %s", exc)
-        return ""
+        return None
 
     model_id = (ai_cfg.get("model") or "gemini-2.5-flash").strip()
     g_cfg = (ai_cfg.get("gemini") or {}) if isinstance(ai_cfg.get("gemini"), dict) else {}
     temperature = float(g_cfg.get("temperature", 0.2))
     max_output_tokens = int(g_cfg.get("max_tokens", 300))
 
+    try:
+        model = _get_gemini_model(model_id, api_key)
+    except Exception as exc:
+        logger.warning("[IA] Erro ao configurar/criar modelo Gemini: %s", exc)
+        return None
+    return model, temperature, max_output_tokens
+
+
+@functools.lru_cache(maxsize=4)
+def _get_gemini_model(model_id: str, api_key: str):
+    """
+    GenerativeModel reaproveitado por (modelo, chave): configure() e a criação
+    do modelo acontecem uma vez por execução, não a cada lote.
+    """
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_id)
+
+
+def _summarize_with_gemini(text: str, ai_cfg: dict) -> str:
+    """
+    Tenta gerar resumo usando Gemini (Google Generative AI).
+    Requer GEMINI_API_KEY configurado.
+    """
+    setup = _gemini_setup(ai_cfg)
+    if setup is None:
+        return ""
+    model, temperature, max_output_tokens = setup
+
     prompt = (
-        "Você é um analista jurídico-tributário especializado em normas publicadas "
-        "no Diário Oficial da União.\n\n"
-        "Leia o texto abaixo (apenas o corpo de um ato oficial) e produza um resumo "
+        _GEMINI_PERSONA
+        + "Leia o texto abaixo (apenas o corpo de um ato oficial) e produza um resumo "
         "em português do Brasil, com no máximo 350 caracteres, em um único parágrafo.\n\n"
         "O resumo deve:\n"
-        "- indicar, se possível, o tipo do ato (lei, decreto, portaria, instrução normativa etc.);\n"
-        "- destacar o tema central e o impacto prático para empresas, com foco em aspectos fiscais, "
-        "tributários, regulatórios ou de incentivos;\n"
-        "- mencionar tributos, benefícios ou obrigações relevantes, quando existirem;\n"
-        "- evitar repetir literalmente o título do ato;\n"
-        "- ser objetivo, técnico e sem adjetivos desnecessários.\n\n"
-        "Texto do ato (corpo):\n"
+        + _GEMINI_REGRAS
+        + "Texto do ato (corpo):\n"
         + text
     )
 
     try:
-        model = genai.GenerativeModel(model_id)
         resp = model.generate_content(
             prompt,
             generation_config={
@@ -208,15 +277,72 @@ def _summarize_with_gemini(text: str, ai_cfg: dict) -> str:
         return ""
 
 
-def _summarize_with_hf(text: str, ai_cfg: dict) -> str:
+def _summarize_many_with_gemini(texts: list[str], ai_cfg: dict) -> list[str]:
+    """
+    Gera resumos para vários textos em UMA chamada ao Gemini.
+
+    Os atos vão no mesmo prompt, separados por marcadores ===ITEM n===, e a
+    resposta é dividida pelos mesmos marcadores. Itens ausentes na resposta
+    ficam como string vazia (o chamador cai no fallback).
+    """
+    if len(texts) <= 1:
+        return [_summarize_with_gemini(t, ai_cfg) for t in texts]
+
+    out = [""] * len(texts)
+    setup = _gemini_setup(ai_cfg)
+    if setup is None:
+        return out
+    model, temperature, max_output_tokens = setup
+
+    blocos = "\n\n".join(f"===ITEM {i}===\n{t}" for i, t in enumerate(texts, start=1))
+    prompt = (
+        _GEMINI_PERSONA
+        + f"Leia os {len(texts)} textos abaixo (cada um é o corpo de um ato oficial, "
+        "precedido de um marcador ===ITEM n===) e produza, para CADA um, um resumo "
+        "em português do Brasil, com no máximo 350 caracteres, em um único parágrafo.\n\n"
+        "Cada resumo deve:\n"
+        + _GEMINI_REGRAS
+        + "Responda apenas com os resumos, cada um precedido do mesmo marcador "
+        "do ato correspondente (===ITEM n===), na mesma ordem.\n\n"
+        + blocos
+    )
+
+    try:
+        resp = model.generate_content(
+            prompt,
+            generation_config={
+                "temperature": temperature,
+                "max_output_tokens": max_output_tokens * len(texts),
+            },
+        )
+        answer = getattr(resp, "text", "") or ""
+    except Exception as exc:
+        logger.warning("[IA] Erro ao chamar Gemini (lote de %d): %s", len(texts), exc)
+        return out
+
+    parts = _RE_ITEM_MARK.split(answer)
+    for num, body in zip(parts[1::2], parts[2::2]):
+        idx = int(num) - 1
+        if 0 <= idx < len(out) and not out[idx]:
+            out[idx] = body.strip()
+    return out
+
+
+@functools.lru_cache(maxsize=4)
+def _get_hf_client(model_id: str, token: str) -> InferenceClient:
+    """InferenceClient reaproveitado por (modelo, token): reusa a sessão HTTP entre itens."""
+    return InferenceClient(model=model_id, token=token)
+
+
+def _hf_setup(ai_cfg: dict):
     """
-    Tenta gerar resumo usando Hugging Face Inference.
-    Requer HF_TOKEN configurado.
+    Resolve modelo e InferenceClient do Hugging Face: devolve (client, model_id)
+    ou None se o HF_TOKEN não estiver definido ou o client falhar.
     """
     token = os.getenv("HF_TOKEN")
     if not token:
         logger.warning("[IA] HF_TOKEN não definido; pulando Hugging Face.")
-        return ""
+        return None
 
     # Pega modelo específico de HF se existir; se não, cai no "model"
     model_id = (ai_cfg.get("hf_model") or ai_cfg.get("model") or "").strip()
@@ -224,11 +350,14 @@ def _summarize_with_hf(text: str, ai_cfg: dict) -> str:
         model_id = "recogna-nlp/ptt5-base-summ-xlsum"
 
     try:
-        client = InferenceClient(model=model_id, token=token)
+        return _get_hf_client(model_id, token), model_id
     except Exception as exc:
         logger.warning("[IA] Erro ao inicializar InferenceClient: %s", exc)
-        return ""
+        return None
 
+
+def _hf_summarize_one(client: InferenceClient, model_id: str, text: str) -> str:
+    """Uma chamada summarization() ao HF; devolve "" em erro."""
     try:
         logger.info("[IA] Chamando summarization() para o modelo HF: %s", model_id)
         # IMPORTANTE: sem passar max_new_tokens aqui, para não quebrar
@@ -237,98 +366,188 @@ def _summarize_with_hf(text: str, ai_cfg: dict) -> str:
         logger.warning("[IA] Erro ao chamar Hugging Face Inference: %s", exc)
         return ""
 
-    summary = ""
     # Possíveis formatos de retorno
     if hasattr(result, "summary_text"):
-        summary = result.summary_text
-    elif isinstance(result, dict) and "summary_text" in result:
-        summary = result["summary_text"]
-    elif isinstance(result, list) and result and isinstance(result[0], dict):
-        summary = result[0].get("summary_text", "")
-    elif isinstance(result, str):
-        summary = result
-    else:
-        summary = str(result)
-
-    return summary
+        return result.summary_text
+    if isinstance(result, dict) and "summary_text" in result:
+        return result["summary_text"]
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        return result[0].get("summary_text", "")
+    if isinstance(result, str):
+        return result
+    return str(result)
 
 
-def generate_summary_ia(full_text: str, cfg: dict) -> str:
+def _summarize_many_with_hf(texts: list[str], ai_cfg: dict) -> list[str]:
     """
-    Gera um resumo curto usando Gemini como provedor principal
-    e Hugging Face como fallback.
-
-    - Usa as configs em cfg['ai']['summaries'].
-    - Requer GEMINI_API_KEY e/ou HF_TOKEN.
-    - Em erro, retorna string vazia para não quebrar o robô.
+    Resume vários textos no Hugging Face, com client e modelo resolvidos uma
+    única vez. O endpoint summarization recebe um texto por chamada; elas saem
+    uma após a outra, e o paralelismo fica só por conta dos lotes (limitados
+    por `concurrency`), para não disparar rajadas justo quando o Gemini cai.
     """
-    ai_cfg = (cfg.get("ai") or {}).get("summaries") or {}
-    if not ai_cfg.get("enabled"):
-        logger.info("[IA] Summaries desabilitados no config.")
-        return ""
+    if not texts:
+        return []
+    setup = _hf_setup(ai_cfg)
+    if setup is None:
+        return [""] * len(texts)
+    return [_hf_summarize_one(*setup, t) for t in texts]
+
 
-    # Limites de entrada/saída
+def _summary_chunks(full_texts: list[str], ai_cfg: dict) -> list[list[tuple[int, str]]]:
+    """
+    Prepara os textos para a IA e os divide em lotes de `batch_size` (padrão 8).
+    Cada lote é uma lista de (índice original, texto preparado); vazios saem.
+    """
     max_chars_input = int(ai_cfg.get("max_chars_input", 4000))
-    max_chars_output = int(ai_cfg.get("max_chars_output", 350))
+    batch_size = max(1, int(ai_cfg.get("batch_size", 8)))
+
+    prepared = [(i, _prepare_summary_text(t, max_chars_input)) for i, t in enumerate(full_texts)]
+    prepared = [(i, t) for i, t in prepared if t]
+    return [prepared[start:start + batch_size] for start in range(0, len(prepared), batch_size)]
 
-    text = _prepare_summary_text(full_text, max_chars_input)
-    if not text:
-        return ""
 
+def _summarize_chunk(chunk: list[tuple[int, str]], ai_cfg: dict) -> list[tuple[int, str]]:
+    """
+    Resume um lote: Gemini numa única chamada e, para o que faltar,
+    Hugging Face (uma chamada por texto). Devolve (índice original, resumo final).
+    """
     provider = (ai_cfg.get("provider") or "gemini").strip().lower()
-    summary = ""
+    max_chars_output = int(ai_cfg.get("max_chars_output", 350))
 
-    # Provider "gemini" ou "fallback" → tenta Gemini primeiro
+    # Provider "gemini" ou "fallback" → tenta Gemini primeiro (um lote por chamada)
+    summaries = [""] * len(chunk)
     if provider in ("gemini", "fallback"):
-        summary = _summarize_with_gemini(text, ai_cfg)
-        if summary:
-            return _postprocess_summary(summary, max_chars_output)
+        summaries = _summarize_many_with_gemini([t for _, t in chunk], ai_cfg)
 
-    # Provider "hf" ou "fallback" ou caso Gemini falhe → tenta HF
+    # Provider "hf" ou "fallback" ou caso Gemini falhe → tenta HF (o que faltou, junto)
     if provider in ("hf", "fallback", "gemini"):
-        summary = _summarize_with_hf(text, ai_cfg)
+        missing = [n for n, summary in enumerate(summaries) if not summary]
+        if missing:
+            hf_out = _summarize_many_with_hf([chunk[n][1] for n in missing], ai_cfg)
+            for n, summary in zip(missing, hf_out):
+                summaries[n] = summary
+
+    out = []
+    for (i, _), summary in zip(chunk, summaries):
         if summary:
-            return _postprocess_summary(summary, max_chars_output)
+            out.append((i, _postprocess_summary(summary, max_chars_output)))
+        else:
+            logger.info("[IA] Não foi possível gerar resumo com os provedores configurados.")
+    return out
+
+
+async def generate_summaries_ia_async(
+    full_texts: list[str], cfg: dict, sem: asyncio.Semaphore | None = None
+) -> list[str]:
+    """
+    Gera resumos curtos para vários textos, na mesma ordem da entrada,
+    usando Gemini como provedor principal e Hugging Face como fallback.
+
+    - Usa as configs em cfg['ai']['summaries'].
+    - Os textos vão ao Gemini em lotes de `batch_size` (padrão 8): uma chamada
+      por lote em vez de uma por matéria.
+    - Itens que o Gemini não resumir caem no Hugging Face.
+    - Os lotes rodam em threads (asyncio.to_thread) e em paralelo, limitados por
+      `concurrency` (padrão 4), sem travar o event loop. Quem chama várias
+      vezes (o run()) passa o seu `sem`, para que o limite valha no total.
+    - Cada vaga fica presa por `pause_sec` (padrão 1s) depois da chamada, para
+      ser gentil com a API: no máximo `concurrency` chamadas por pausa.
+    - Requer GEMINI_API_KEY e/ou HF_TOKEN.
+    - Em erro, o item fica com string vazia para não quebrar o robô.
+    """
+    results = [""] * len(full_texts)
+    ai_cfg = (cfg.get("ai") or {}).get("summaries") or {}
+    if not ai_cfg.get("enabled"):
+        logger.info("[IA] Summaries desabilitados no config.")
+        return results
+
+    if sem is None:
+        sem = asyncio.Semaphore(max(1, int(ai_cfg.get("concurrency", 4))))
+    pause = max(0.0, float(ai_cfg.get("pause_sec", 1.0)))
+
+    async def _guarded(chunk):
+        async with sem:
+            out = await asyncio.to_thread(_summarize_chunk, chunk, ai_cfg)
+            if pause:
+                await asyncio.sleep(pause)
+            return out
+
+    done = await asyncio.gather(*[_guarded(c) for c in _summary_chunks(full_texts, ai_cfg)])
+    for chunk_out in done:
+        for i, summary in chunk_out:
+            results[i] = summary
+    return results
 
-    logger.info("[IA] Não foi possível gerar resumo com os provedores configurados.")
-    return ""
 
 # ---------------------------------------------------------------------------
 # Utilitários de configuração e estado
 # ---------------------------------------------------------------------------
 
+# Loader em C (libyaml) quando o PyYAML foi compilado com ele
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def load_config() -> dict:
     """Lê o config.yml e devolve um dict Python com as configurações do robô."""
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    with open(CONFIG_FILE, "rb") as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def load_seen() -> set:
     """
-    Carrega a lista de publicações já enviadas (state/seen.json)
+    Carrega as publicações já enviadas (state/seen.txt, uma chave por linha)
     e devolve um set() para facilitar checagens de duplicidade.
+    Se só existir o state/seen.json antigo, usa a lista JSON dele.
+    Entradas antigas com a URL crua (sem prefixo) viram 'url:<url>', para que
+    a checagem só precise das chaves de build_seen_keys.
     """
     STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    if STATE_FILE.exists():
-        try:
-            with open(STATE_FILE, "r", encoding="utf-8") as f:
+    keys = []
+    try:
+        if STATE_FILE.exists():
+            keys = STATE_FILE.read_text(encoding="utf-8").splitlines()
+        elif LEGACY_STATE_FILE.exists():
+            with open(LEGACY_STATE_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                return set(data if isinstance(data, list) else [])
-        except Exception:
-            return set()
-    return set()
+                keys = data if isinstance(data, list) else []
+    except Exception:
+        return set()
+    return {
+        k if k.startswith(("url:", "id:")) else f"url:{k}"
+        for k in keys if k
+    }
 
 
-def save_seen(seen: set) -> None:
-    """Salva o conjunto de itens já vistos em state/seen.json."""
+def save_seen(seen: set, new_keys: list[str]) -> None:
+    """
+    Registra em state/seen.txt as chaves novas desta execução (append: custo
+    proporcional ao que entrou, não ao histórico). Se o arquivo ainda não
+    existir (primeira execução ou migração do seen.json), grava o set inteiro.
+    """
     STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(sorted(seen), f, ensure_ascii=False, indent=2)
+    if not STATE_FILE.exists():
+        STATE_FILE.write_text("".join(k + "\n" for k in sorted(seen)), encoding="utf-8")
+        return
+    if new_keys:
+        with open(STATE_FILE, "a", encoding="utf-8") as f:
+            f.write("".join(k + "\n" for k in new_keys))
 
 # ---------------------------------------------------------------------------
 # Função shorten_orgao(...) para encurtar o nome do órgão
 # ---------------------------------------------------------------------------
 
+# Acentos do português → ASCII via str.translate (em C); a tabela sai do
+# próprio anyascii, que fica só para o que sobrar fora dela.
+_FOLD = str.maketrans({c: anyascii(c) for c in "áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑºª"})
+
+
+def ascii_fold(txt: str) -> str:
+    """Translitera para ASCII; equivalente a anyascii(txt), mais rápido no caso comum."""
+    t = txt.translate(_FOLD)
+    return t if t.isascii() else anyascii(t)
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize(txt: str) -> str:
     """
     Normaliza textos (minúsculas, sem acentos, espaços colapsados)
@@ -336,10 +555,40 @@ def normalize(txt: str) -> str:
     """
     if not txt:
         return ""
-    t = unidecode(txt).lower()
-    t = re.sub(r"\s+", " ", t)
+    t = ascii_fold(txt).lower()
+    t = _RE_WS.sub(" ", t)
     return t.strip()
 
+
+# Mapeamentos específicos que você já viu na prática
+_ORGAO_REPLACEMENTS = [
+    (
+        "Ministério da Fazenda/Secretaria Especial da Receita Federal do Brasil/Secretaria-Adjunta/Superintendência Regional da Receita Federal do Brasil 8ª Região Fiscal/Delegacia da Receita Federal do Brasil em Sorocaba",
+        "Min. Fazenda / RFB / DRF Sorocaba",
+    ),
+    (
+        "Ministério da Fazenda/Secretaria Especial da Receita Federal do Brasil/Secretaria-Adjunta",
+        "Min. Fazenda / RFB / Secretaria-Adjunta",
+    ),
+    (
+        "Ministério da Fazenda/Secretaria Especial da Receita Federal do Brasil",
+        "Min. Fazenda / RFB",
+    ),
+    (
+        "Ministério da Fazenda/Conselho Nacional de Política Fazendária",
+        "Min. Fazenda / Confaz",
+    ),
+    (
+        "Ministério da Ciência, Tecnologia e Inovação/Conselho Nacional de Desenvolvimento Científico e Tecnológico",
+        "MCTI / CNPq",
+    ),
+]
+_ORGAO_INDEX = {long_txt: i for i, (long_txt, _) in enumerate(_ORGAO_REPLACEMENTS)}
+# Uma só alternância: uma varredura do nome do órgão testa todos os mapeamentos
+_RE_ORGAO_LONG = re.compile("|".join(re.escape(long_txt) for long_txt, _ in _ORGAO_REPLACEMENTS))
+
+
+@functools.lru_cache(maxsize=1024)
 def shorten_orgao(orgao: str) -> str:
     """
     Encurta nomes longos de órgãos para uma forma mais compacta no e-mail.
@@ -350,39 +599,59 @@ def shorten_orgao(orgao: str) -> str:
 
     o = orgao.strip()
 
-    # Mapeamentos específicos que você já viu na prática
-    replacements = [
-        (
-            "Ministério da Fazenda/Secretaria Especial da Receita Federal do Brasil/Secretaria-Adjunta/Superintendência Regional da Receita Federal do Brasil 8ª Região Fiscal/Delegacia da Receita Federal do Brasil em Sorocaba",
-            "Min. Fazenda / RFB / DRF Sorocaba",
-        ),
-        (
-            "Ministério da Fazenda/Secretaria Especial da Receita Federal do Brasil/Secretaria-Adjunta",
-            "Min. Fazenda / RFB / Secretaria-Adjunta",
-        ),
-        (
-            "Ministério da Fazenda/Secretaria Especial da Receita Federal do Brasil",
-            "Min. Fazenda / RFB",
-        ),
-        (
-            "Ministério da Fazenda/Conselho Nacional de Política Fazendária",
-            "Min. Fazenda / Confaz",
-        ),
-        (
-            "Ministério da Ciência, Tecnologia e Inovação/Conselho Nacional de Desenvolvimento Científico e Tecnológico",
-            "MCTI / CNPq",
-        ),
-    ]
-
-    for long_txt, short_txt in replacements:
-        if long_txt in o:
-            return short_txt
+    # Vale o primeiro mapeamento da lista que aparecer no texto
+    hits = [_ORGAO_INDEX[m.group(0)] for m in _RE_ORGAO_LONG.finditer(o)]
+    if hits:
+        return _ORGAO_REPLACEMENTS[min(hits)][1]
 
     # Fallback: se ficar muito grande, corta com reticências
     if len(o) > 120:
         return o[:117] + "..."
     return o
 
+# Linhas típicas do cabeçalho do DOU (str.startswith aceita a tupla inteira)
+_DOU_HEADER_PREFIXES = (
+    "Brasão do Brasil",
+    "Diário Oficial da União",
+    "Publicado em:",
+    "Edição:",
+    "Seção:",
+    "Página:",
+    "Órgão:",
+)
+
+# Normalizações do texto bruto usadas pelo extract_body_snippet
+_RE_HSPACE = re.compile(r"[ \t]+")
+_SEPARATOR_LINES = frozenset({"|", "•", "-"})
+_RE_ASSUNTO = re.compile(r"\bAssunto:\s*", re.I)
+_RE_DATE_META = re.compile(r"\b\d{2}/\d{2}/\d{4}\s+\d+\s+\d+\s+Minist[eé]rio\b")
+
+# Inícios típicos do corpo, em ordem de prioridade (o primeiro que casar vence):
+# "O ADVOGADO-GERAL...", "O PRESIDENTE...", "Resolve:", etc.
+_BODY_MARKERS = [
+    re.compile(r"\bO\s+[A-ZÁÀÂÃÉÈÊÍÌÎÓÒÔÕÚÙÛÇ][A-ZÁÀÂÃÉÈÊÍÌÎÓÒÔÕÚÙÛÇ\s\-]{3,}?\b"),  # "O ADVOGADO-GERAL..."
+    re.compile(r"\bRESOLVE\b"),
+    re.compile(r"\bDECRETA\b"),
+    re.compile(r"\bCONSIDERANDO\b"),
+    re.compile(r"\bArt\.\s*\d+º?\b"),
+]
+
+
+# Começos que indicam que o trecho ainda é metadado / título repetido
+_SNIPPET_BAD_STARTS = (
+    "Ministério",
+    "PORTARIA",
+    "LEI",
+    "DECRETO",
+    "RESOLUÇÃO",
+    "DESPACHO",
+    "ATO DECLARATÓRIO",
+    "SOLUÇÃO DE CONSULTA",
+    "Solução de Consulta",
+    "Ato Declaratório",
+)
+
+
 def extract_body_snippet(texto_bruto: str, max_chars: int = 320) -> str:
     """
     Extrai um "primeiro trecho do corpo" (fallback sem IA) a partir do texto bruto.
@@ -397,60 +666,44 @@ def extract_body_snippet(texto_bruto: str, max_chars: int = 320) -> str:
     if not t:
         return ""
 
-    # Normaliza espaços/quebras
-    t = re.sub(r"[ \t]+", " ", t)
-    t = re.sub(r"\n{2,}", "\n", t)
-
-    lines = [ln.strip() for ln in t.splitlines() if ln.strip()]
-    if not lines:
-        return ""
+    # Normaliza espaços (linhas em branco somem no laço abaixo)
+    t = _RE_HSPACE.sub(" ", t)
 
-    # Remove linhas típicas do cabeçalho do DOU
-    header_prefixes = (
-        "Brasão do Brasil",
-        "Diário Oficial da União",
-        "Publicado em:",
-        "Edição:",
-        "Seção:",
-        "Página:",
-        "Órgão:",
-    )
+    # Uma passada pelas linhas: strip uma vez e, no mesmo laço, separa as
+    # típicas do cabeçalho do DOU e as linhas isoladas de separador
+    lines = []
     cleaned_lines = []
-    for ln in lines:
-        if any(ln.startswith(p) for p in header_prefixes):
+    for ln in t.splitlines():
+        ln = ln.strip()
+        if not ln:
             continue
-        # Também ignora linhas isoladas de separador
-        if ln in {"|", "•", "-"}:
+        lines.append(ln)
+        if ln.startswith(_DOU_HEADER_PREFIXES) or ln in _SEPARATOR_LINES:
             continue
         cleaned_lines.append(ln)
 
+    if not lines:
+        return ""
     if not cleaned_lines:
-        cleaned_lines = lines[:]  # fallback
+        cleaned_lines = lines  # fallback
 
     # Junta tudo num texto contínuo
     text = " ".join(cleaned_lines)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _RE_WS.sub(" ", text).strip()
 
     # Se existir "Assunto:", geralmente é o melhor ponto de corte (ex.: Solução de Consulta)
-    m_assunto = re.search(r"\bAssunto:\s*", text, re.I)
+    m_assunto = _RE_ASSUNTO.search(text)
     if m_assunto:
         text = text[m_assunto.end():].strip()
 
     # Remove metadados em linha (data/edição/página/órgão) quando grudados no texto
-    text = re.sub(r"\b\d{2}/\d{2}/\d{4}\s+\d+\s+\d+\s+Minist[eé]rio\b", "Ministério", text)
+    text = _RE_DATE_META.sub("Ministério", text)
 
     # Heurística: corta antes do "miolo" normativo (quando dá)
-    # Procuramos um início típico do corpo, tipo: "O ADVOGADO-GERAL...", "O PRESIDENTE...", "Resolve:", etc.
-    body_markers = [
-        r"\bO\s+[A-ZÁÀÂÃÉÈÊÍÌÎÓÒÔÕÚÙÛÇ][A-ZÁÀÂÃÉÈÊÍÌÎÓÒÔÕÚÙÛÇ\s\-]{3,}?\b",  # "O ADVOGADO-GERAL..."
-        r"\bRESOLVE\b",
-        r"\bDECRETA\b",
-        r"\bCONSIDERANDO\b",
-        r"\bArt\.\s*\d+º?\b",
-    ]
+    # (padrões em _BODY_MARKERS)
     cut_pos = None
-    for pat in body_markers:
-        m = re.search(pat, text)
+    for pat in _BODY_MARKERS:
+        m = pat.search(text)
         if m:
             cut_pos = m.start()
             break
@@ -459,19 +712,7 @@ def extract_body_snippet(texto_bruto: str, max_chars: int = 320) -> str:
         text = text[cut_pos:].strip()
 
     # Evita retornar algo que ainda seja só metadado / título repetido
-    bad_starts = (
-        "Ministério",
-        "PORTARIA",
-        "LEI",
-        "DECRETO",
-        "RESOLUÇÃO",
-        "DESPACHO",
-        "ATO DECLARATÓRIO",
-        "SOLUÇÃO DE CONSULTA",
-        "Solução de Consulta",
-        "Ato Declaratório",
-    )
-    if any(text.startswith(bs) for bs in bad_starts):
+    if text.startswith(_SNIPPET_BAD_STARTS):
         # tenta pegar após a primeira frase/linha de título
         # (busca o primeiro ponto seguido de espaço)
         dot = text.find(". ")
@@ -495,24 +736,27 @@ def extract_body_snippet(texto_bruto: str, max_chars: int = 320) -> str:
 # Heurísticas de texto/link
 # ---------------------------------------------------------------------------
 
+# Textos de âncora que são menu/navegação, não matérias
+BAD_ANCHOR_TEXTS = frozenset([
+    "Última hora", "Ultima hora",
+    "Últimas 24 horas", "Ultimas 24 horas",
+    "Semana passada", "Mes passado", "Mês passado",
+    "Ano passado", "Período Personalizado", "Periodo Personalizado",
+    "Pesquisa avançada", "Pesquisa Avançada", "Pesquisa",
+    "Verificação de autenticidade", "Voltar ao topo",
+    "Portal", "Tutorial", "Termo de Uso",
+    "Ir para o conteúdo", "Ir para o rodapé",
+    "REPORTAR ERRO", "Diário Oficial da União",
+])
+BAD_TEXT_PAT = re.compile(r"(últim|ultima|semana|m[eê]s|ano|per[ií]odo).*(\(\d+\))?$", re.I)
+
+
 def looks_like_menu(text: str) -> bool:
     """
     Heurística para identificar textos de links que parecem ser
     itens de menu/navegação (Última hora, Voltar ao topo, etc.)
     e não resultados de matérias.
     """
-    BAD_ANCHOR_TEXTS = [
-        "Última hora", "Ultima hora",
-        "Últimas 24 horas", "Ultimas 24 horas",
-        "Semana passada", "Mes passado", "Mês passado",
-        "Ano passado", "Período Personalizado", "Periodo Personalizado",
-        "Pesquisa avançada", "Pesquisa Avançada", "Pesquisa",
-        "Verificação de autenticidade", "Voltar ao topo",
-        "Portal", "Tutorial", "Termo de Uso",
-        "Ir para o conteúdo", "Ir para o rodapé",
-        "REPORTAR ERRO", "Diário Oficial da União",
-    ]
-    BAD_TEXT_PAT = re.compile(r"(últim|ultima|semana|m[eê]s|ano|per[ií]odo).*(\(\d+\))?$", re.I)
     t = (text or "").strip()
     if not t:
         return False
@@ -541,6 +785,28 @@ def absolutize(href: str) -> str:
     return "https://www.in.gov.br" + ("/" + href.lstrip("./"))
 
 
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid"})
+
+
+def normalize_url(url: str) -> str:
+    """
+    Forma canônica de uma URL para deduplicação: host em minúsculas e sem
+    parâmetros de rastreamento (utm_*, fbclid, gclid). A query só é
+    remontada quando algum parâmetro é removido.
+    """
+    parts = urlsplit(url)
+    query = parts.query
+    if query:
+        params = parse_qsl(query, keep_blank_values=True)
+        kept = [
+            (k, v) for k, v in params
+            if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+        ]
+        if len(kept) != len(params):
+            query = urlencode(kept)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, parts.fragment))
+
+
 def ensure_quoted(s: str) -> str:
     """Garante que uma string esteja entre aspas duplas."""
     s = s.strip()
@@ -565,6 +831,40 @@ def _escape_html(t: str) -> str:
     """Escapa caracteres especiais para HTML."""
     return html.escape(t or "", quote=True)
 
+
+@dataclass(slots=True)
+class _EmailItem:
+    """
+    Campos de um item já prontos para o e-mail, calculados uma única vez
+    e compartilhados pelos passes de texto simples e HTML.
+    """
+    titulo: str
+    org_short: str
+    data_pub: str
+    url: str
+    rotulo: str  # "Resumo" (IA ou editorial), "Trecho" (corpo) ou ""
+    corpo: str
+
+
+# Padrões usados na montagem do e-mail (destinatários e agrupamento)
+_RE_EMAIL_SEP = re.compile(r"[;,]")
+# Resumos com restos da página (script/compartilhamento) saem do e-mail
+_RE_EMAIL_BAD_SUMMARY = re.compile("|".join(map(re.escape, [
+    "acesse o script",
+    "script:",
+    "compartilhe o conteudo da pagina",
+    "compartilhe o conteúdo da página",
+])), re.IGNORECASE)
+_RE_GK_NUMERO = re.compile(r"\bN[ºO\.\s]*\s*[\d\.\-\/]+")
+_RE_GK_DATA_EXTENSO = re.compile(r"\bDE\s+\d{1,2}\s+DE\s+[A-Z]+(?:\s+DE\s+\d{4})?\b")
+_RE_GK_ANO = re.compile(r"\bDE\s+\d{4}\b")
+_RE_GK_TRACOS = re.compile(r"[–—\-]+")
+_RE_NON_DIGIT = re.compile(r"\D")
+
+# Número do ato ("Nº 9.853", "n. 123/2026"), usado no e-mail e no enrich
+_RE_NUMERO_ATO = re.compile(r"\bN[ºo\.]?\s*([\d\.]+(?:/\d{4})?)", re.I)
+
+
 def send_email(items: list[dict], cfg: dict) -> None:
     """
     Monta e envia o e-mail de informe com os atos encontrados.
@@ -573,29 +873,18 @@ def send_email(items: list[dict], cfg: dict) -> None:
     """
 
     def _extract_emails(element):
-        import re as _re
         if not element:
             return []
         if isinstance(element, list):
             return [e.strip() for e in element if e and e.strip()]
         if isinstance(element, str):
-            return [e.strip() for e in _re.split(r"[;,]", element) if e.strip()]
+            return [e.strip() for e in _RE_EMAIL_SEP.split(element) if e.strip()]
         return []
 
     def clean_summary(resumo: str | None) -> str:
-        if not resumo:
-            return ""
-        r = resumo.strip()
-        if not r:
-            return ""
-        low = r.lower()
-        if "acesse o script" in low:
-            return ""
-        if "script:" in low:
-            return ""
-        if "compartilhe o conteudo da pagina" in low or "compartilhe o conteúdo da página" in low:
-            return ""
-        if len(r) < 40:
+        r = (resumo or "").strip()
+        # vazio, curto demais ou com restos da página: descarta
+        if len(r) < 40 or _RE_EMAIL_BAD_SUMMARY.search(r):
             return ""
         return r
 
@@ -603,8 +892,8 @@ def send_email(items: list[dict], cfg: dict) -> None:
 
     def _norm_key(s: str) -> str:
         s = (s or "").upper()
-        s = unidecode(s)
-        s = re.sub(r"\s+", " ", s).strip()
+        s = ascii_fold(s)
+        s = _RE_WS.sub(" ", s).strip()
         return s
 
     def build_group_key(title: str) -> str:
@@ -615,16 +904,16 @@ def send_email(items: list[dict], cfg: dict) -> None:
         t = _norm_key(title)
 
         # remove "Nº 9.853", "N 236", "n° 1.688", etc.
-        t = re.sub(r"\bN[ºO\.\s]*\s*[\d\.\-\/]+", "", t)
+        t = _RE_GK_NUMERO.sub("", t)
 
         # remove "DE 30 DE JANEIRO DE 2026" / "DE 11 DE DEZEMBRO DE 2025"
-        t = re.sub(r"\bDE\s+\d{1,2}\s+DE\s+[A-Z]+(?:\s+DE\s+\d{4})?\b", "", t)
+        t = _RE_GK_DATA_EXTENSO.sub("", t)
 
         # remove "DE 2026" solto
-        t = re.sub(r"\bDE\s+\d{4}\b", "", t)
+        t = _RE_GK_ANO.sub("", t)
 
-        t = re.sub(r"[–—\-]+", " ", t)
-        t = re.sub(r"\s+", " ", t).strip()
+        t = _RE_GK_TRACOS.sub(" ", t)
+        t = _RE_WS.sub(" ", t).strip()
 
         return t if len(t) >= 10 else ""
 
@@ -635,16 +924,21 @@ def send_email(items: list[dict], cfg: dict) -> None:
             return num
 
         t = (it.get("titulo") or "")
-        m = re.search(r"\bN[ºo\.]?\s*([\d\.]+(?:/\d{4})?)", t, re.I)
+        m = _RE_NUMERO_ATO.search(t)
         return m.group(1).strip() if m else ""
 
     def _num_to_int(num: str):
         # só converte números simples (ex.: "9.853" -> 9853). Se for "123/2026", ignora.
         if not num or "/" in num:
             return None
-        digits = re.sub(r"\D", "", num)
+        digits = _RE_NON_DIGIT.sub("", num)
         return int(digits) if digits else None
 
+    def _group_sort_key(x: dict) -> tuple:
+        # dentro de um grupo: numerados primeiro, em ordem numérica; depois título
+        n = _num_to_int(_extract_num(x))
+        return (n is None, n or 0, (x.get("titulo") or ""))
+
     def _guess_tipo(group_key: str) -> str:
         for tipo in [
             "PORTARIA",
@@ -667,33 +961,25 @@ def send_email(items: list[dict], cfg: dict) -> None:
         - se bucket >= min_reps, emite 1 bloco no ponto da 1ª ocorrência
         - as demais ocorrências do mesmo bucket são suprimidas
         """
+        # chave de cada item calculada uma vez (reusada na segunda passada)
+        keys = [build_group_key((it.get("titulo") or "").strip()) for it in items_in]
         buckets: dict[str, list[int]] = {}
-        for idx, it in enumerate(items_in):
-            key = build_group_key((it.get("titulo") or "").strip())
-            if not key:
-                continue
-            buckets.setdefault(key, []).append(idx)
+        for idx, key in enumerate(keys):
+            if key:
+                buckets.setdefault(key, []).append(idx)
 
         group_keys = {k for k, idxs in buckets.items() if len(idxs) >= min_reps}
 
         out: list[dict] = []
         emitted: set[str] = set()
 
-        for idx, it in enumerate(items_in):
-            key = build_group_key((it.get("titulo") or "").strip())
+        for it, key in zip(items_in, keys):
             if key and key in group_keys:
                 if key in emitted:
                     continue
                 emitted.add(key)
 
-                idxs = buckets[key]
-                group_list = [items_in[i] for i in idxs]
-
-                def _sortk(x):
-                    n = _num_to_int(_extract_num(x))
-                    return (n is None, n or 0, (x.get("titulo") or ""))
-
-                group_list.sort(key=_sortk)
+                group_list = sorted((items_in[i] for i in buckets[key]), key=_group_sort_key)
 
                 out.append({"_is_group": True, "group_key": key, "items": group_list})
             else:
@@ -725,16 +1011,15 @@ def send_email(items: list[dict], cfg: dict) -> None:
     period_label = cfg.get("search", {}).get("period_effective")
     days_window = cfg.get("search", {}).get("days_window")
 
+    hoje = datetime.now(BR_TZ)
+    hoje_str = hoje.strftime("%d/%m/%Y")
     if days_window and days_window > 0:
-        hoje = datetime.now(timezone(timedelta(hours=-3)))
         inicio = (hoje - timedelta(days=days_window)).strftime("%d/%m/%Y")
-        fim = hoje.strftime("%d/%m/%Y")
-        days_label = f"{inicio} a {fim}"
+        days_label = f"{inicio} a {hoje_str}"
     else:
         days_label = "sem limite (qualquer período)"
 
     prefix = cfg.get("email", {}).get("subject_prefix", "[DOU]")
-    hoje_str = datetime.now(timezone(timedelta(hours=-3))).strftime("%d/%m/%Y")
     subject = f"{prefix} Boletim diário – {hoje_str}"
 
     phrases = cfg.get("search", {}).get("phrases", [])
@@ -745,6 +1030,30 @@ def send_email(items: list[dict], cfg: dict) -> None:
 
     ai_enabled = bool((cfg.get("ai") or {}).get("summaries", {}).get("enabled"))
 
+    def _email_item(it: dict) -> _EmailItem:
+        """
+        Resolve os campos exibidos de um item. Prioridade do texto:
+        resumo IA > resumo editorial > trecho do corpo (só extraído se preciso).
+        """
+        org = (it.get("orgao") or "").strip()
+        resumo = clean_summary((it.get("resumo_ia") or "").strip()) or (it.get("resumo_editorial") or "").strip()
+        if resumo:
+            rotulo, corpo = "Resumo", resumo
+        else:
+            corpo = extract_body_snippet(it.get("texto_bruto") or "", max_chars=320)
+            rotulo = "Trecho" if corpo else ""
+        return _EmailItem(
+            titulo=(it.get("titulo") or "").strip(),
+            org_short=shorten_orgao(org) if org else "",
+            data_pub=(it.get("data") or "").strip(),
+            url=(it.get("url") or "").strip(),
+            rotulo=rotulo,
+            corpo=corpo,
+        )
+
+    # Uma visão por item (chave: id do dict), reaproveitada nos dois passes
+    views = {id(it): _email_item(it) for it in items}
+
     # aplica agrupamento SOMENTE no plain text
     items_plain = group_items_for_plain_text_inplace(items, min_reps=4)
 
@@ -764,9 +1073,8 @@ def send_email(items: list[dict], cfg: dict) -> None:
                 group_key = it.get("group_key") or "Publicações repetidas"
                 group_list = it.get("items") or []
 
-                # órgão abreviado (1x)
-                org0 = (group_list[0].get("orgao") or "").strip() if group_list else ""
-                org_short = shorten_orgao(org0) if org0 else ""
+                # órgão abreviado (1x): já calculado na visão do 1º item
+                org_short = views[id(group_list[0])].org_short if group_list else ""
 
                 # faixa de nº (se todos forem numéricos comparáveis)
                 nums = [_extract_num(x) for x in group_list]
@@ -804,33 +1112,21 @@ def send_email(items: list[dict], cfg: dict) -> None:
                 continue
 
             # --- item normal (igual ao seu formato atual) ---
-            titulo = (it.get("titulo") or "").strip()
-            org = (it.get("orgao") or "").strip()
-            data_pub = (it.get("data") or "").strip()
-            url = (it.get("url") or "").strip()
-            resumo_editorial = (it.get("resumo_editorial") or "").strip()
-            resumo_ia = clean_summary((it.get("resumo_ia") or "").strip())
-            snippet = extract_body_snippet(it.get("texto_bruto") or "", max_chars=320)
-
-            if titulo:
-                text_lines.append(titulo)
-
-            if resumo_ia:
-                text_lines.append(f"Resumo: {resumo_ia}")
-            elif resumo_editorial:
-                text_lines.append(f"Resumo: {resumo_editorial}")
-            else:
-                if snippet:
-                    text_lines.append(f"Trecho: {snippet}")
+            v = views[id(it)]
+
+            if v.titulo:
+                text_lines.append(v.titulo)
+
+            if v.corpo:
+                text_lines.append(f"{v.rotulo}: {v.corpo}")
 
-            org_short = shorten_orgao(org) if org else ""
             footer_parts = []
-            if org_short:
-                footer_parts.append(org_short)
-            if data_pub:
-                footer_parts.append(data_pub)
-            if url:
-                footer_parts.append(f"ver no DOU ({url})")
+            if v.org_short:
+                footer_parts.append(v.org_short)
+            if v.data_pub:
+                footer_parts.append(v.data_pub)
+            if v.url:
+                footer_parts.append(f"ver no DOU ({v.url})")
 
             if footer_parts:
                 text_lines.append(" · ".join(footer_parts))
@@ -866,61 +1162,52 @@ def send_email(items: list[dict], cfg: dict) -> None:
         f"| Período lógico: {_escape_html(str(period_label))}</p>"
     )
 
-    if not items:
-        html_lines.append("<p>Não foram encontradas publicações relevantes para os critérios atuais.</p>")
-    else:
-        for it in items:
-            titulo = (it.get("titulo") or "").strip()
-            org = (it.get("orgao") or "").strip()
-            data_pub = (it.get("data") or "").strip()
-            url = (it.get("url") or "").strip()
-            resumo_editorial = (it.get("resumo_editorial") or "").strip()
-            resumo_ia = clean_summary((it.get("resumo_ia") or "").strip())
-            snippet = extract_body_snippet(it.get("texto_bruto") or "", max_chars=320)
-
-            org_short = shorten_orgao(org) if org else ""
-
-            html_lines.append("<p style='margin-bottom:12px;'>")
-            html_lines.append(f"<b>{_escape_html(titulo)}</b><br/>" if titulo else "")
-
-            if resumo_ia:
-                html_lines.append(
-                    "<span style='font-size:13px;color:#000;'>"
-                    f"<b>Resumo:</b> {_escape_html(resumo_ia)}"
-                    "</span><br/>"
-                )
-            elif resumo_editorial:
-                html_lines.append(
-                    "<span style='font-size:13px;color:#000;'>"
-                    f"<b>Resumo:</b> {_escape_html(resumo_editorial)}"
-                    "</span><br/>"
-                )
-            else:
-                if snippet:
-                    html_lines.append(
-                        "<span style='font-size:13px;color:#000;'>"
-                        f"<b>Trecho:</b> {_escape_html(snippet)}"
-                        "</span><br/>"
-                    )
+    # Órgão e data se repetem muito entre itens: cada valor é escapado uma vez
+    esc_cache: dict[str, str] = {}
 
-            footer_parts = []
-            if org_short:
-                footer_parts.append(_escape_html(org_short))
-            if data_pub:
-                footer_parts.append(_escape_html(data_pub))
-            if url:
-                footer_parts.append(
-                    f"<a href='{_escape_html(url)}' target='_blank' rel='noopener'>ver no DOU</a>"
-                )
+    def _esc_repeated(t: str) -> str:
+        out = esc_cache.get(t)
+        if out is None:
+            out = esc_cache[t] = _escape_html(t)
+        return out
 
-            if footer_parts:
-                html_lines.append(
-                    "<span style='font-size:12px;color:#555;'>"
-                    + " · ".join(footer_parts)
-                    + "</span>"
-                )
+    def _html_item(v: _EmailItem) -> str:
+        """Bloco <p> de um item, já unido por quebras de linha."""
+        block = [
+            "<p style='margin-bottom:12px;'>",
+            f"<b>{_escape_html(v.titulo)}</b><br/>" if v.titulo else "",
+        ]
+
+        if v.corpo:
+            block.append(
+                "<span style='font-size:13px;color:#000;'>"
+                f"<b>{v.rotulo}:</b> {_escape_html(v.corpo)}"
+                "</span><br/>"
+            )
+
+        footer_parts = []
+        if v.org_short:
+            footer_parts.append(_esc_repeated(v.org_short))
+        if v.data_pub:
+            footer_parts.append(_esc_repeated(v.data_pub))
+        if v.url:
+            footer_parts.append(
+                f"<a href='{_escape_html(v.url)}' target='_blank' rel='noopener'>ver no DOU</a>"
+            )
+        if footer_parts:
+            block.append(
+                "<span style='font-size:12px;color:#555;'>"
+                + " · ".join(footer_parts)
+                + "</span>"
+            )
 
-            html_lines.append("</p>")
+        block.append("</p>")
+        return "\n".join(block)
+
+    if not items:
+        html_lines.append("<p>Não foram encontradas publicações relevantes para os critérios atuais.</p>")
+    else:
+        html_lines.extend(_html_item(views[id(it)]) for it in items)
 
     html_lines.append(
         "<p style='font-size:12px;color:#777;'>"
@@ -969,11 +1256,18 @@ def send_email(items: list[dict], cfg: dict) -> None:
 
     all_recipients = to_list + cc_list + bcc_list
 
-    context = ssl.create_default_context()
-    with smtplib.SMTP(host, port) as server:
-        server.starttls(context=context)
+    # send_message serializa direto em bytes (sem passar por as_string())
+    tls = ssl.create_default_context()
+    if port == 465:
+        # TLS implícito (SMTP_SSL), sem a ida e volta do STARTTLS
+        server = smtplib.SMTP_SSL(host, port, context=tls, timeout=30)
+    else:
+        server = smtplib.SMTP(host, port, timeout=30)
+    with server:
+        if port != 465:
+            server.starttls(context=tls)
         server.login(user, pwd)
-        server.sendmail(from_addr, all_recipients, msg.as_string())
+        server.send_message(msg, from_addr, all_recipients)
 
     print(f"Email enviado para {', '.join(all_recipients)} com {len(items)} item(ns).")
 
@@ -982,6 +1276,50 @@ def send_email(items: list[dict], cfg: dict) -> None:
 # Scraping helpers – busca no DOU
 # ---------------------------------------------------------------------------
 
+# Tipos de recurso que o robô não usa (só precisa do HTML/JS e do XHR da busca).
+# "other" cobre beacons/pings de analytics.
+_BLOCKED_RESOURCE_TYPES = frozenset(
+    {"image", "media", "font", "stylesheet", "texttrack", "manifest", "other"}
+)
+
+
+async def _block_heavy_resources(route):
+    """Aborta recursos pesados (imagens/mídia/fontes/css/analytics) que o robô não usa."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Período lógico -> valor de exactDate da busca do DOU (padrão: "dia")
+_PERIOD_EXACT_DATE = {
+    # edição do dia
+    "today": "dia",
+    "day": "dia",
+    "dia": "dia",
+    "hoje": "dia",
+    "edicao": "dia",
+    "edição": "dia",
+
+    # última semana
+    "week": "semana",
+    "semana": "semana",
+
+    # último mês
+    "month": "mes",
+    "mes": "mes",
+    "mês": "mes",
+
+    # qualquer período
+    "any": "all",
+    "all": "all",
+    "qualquer": "all",
+    "qualquer periodo": "all",
+    "qualquer período": "all",
+}
+_VALID_SECTIONS = frozenset({"do1", "do2", "do3", "todos"})
+
+
 def build_direct_query_url(phrase: str, period: str, section_code: str) -> str:
     """
     Monta a URL de busca direta no site do DOU (consulta/-/buscar/dou),
@@ -991,72 +1329,48 @@ def build_direct_query_url(phrase: str, period: str, section_code: str) -> str:
     - Para "today" (edição do dia) usamos exactDate=dia.
     - Para outros períodos, mapeamos para semana/mês/all conforme o DOU.
     """
-    period_map = {
-        # edição do dia
-        "today": "dia",
-        "day": "dia",
-        "dia": "dia",
-        "hoje": "dia",
-        "edicao": "dia",
-        "edição": "dia",
-
-        # última semana
-        "week": "semana",
-        "semana": "semana",
-
-        # último mês
-        "month": "mes",
-        "mes": "mes",
-        "mês": "mes",
-
-        # qualquer período
-        "any": "all",
-        "all": "all",
-        "qualquer": "all",
-        "qualquer periodo": "all",
-        "qualquer período": "all",
-    }
-
-    exact = period_map.get(period, "dia")
+    exact = _PERIOD_EXACT_DATE.get(period, "dia")
 
     # Monta a query (busca exata pela frase)
     core = strip_outer_quotes(phrase)
     q = '%22' + quote_plus(core) + '%22'
 
-    s = section_code if section_code in {"do1", "do2", "do3", "todos"} else "do1"
+    s = section_code if section_code in _VALID_SECTIONS else "do1"
     return (
         "https://www.in.gov.br/consulta/-/buscar/dou"
         f"?q={q}&s={s}&exactDate={exact}&sortType=0"
     )
 
 
+# Uma única passada (TreeWalker só de elementos) por raiz: junta os <a href>
+# e anota os hosts de Shadow DOM, que são visitados depois, na ordem do documento.
+_JS_DEEP_ANCHORS = """
+() => {
+    const anchors = [];
+    function collectFrom(root) {
+        const hosts = [];
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT);
+        for (let el = walker.nextNode(); el; el = walker.nextNode()) {
+            if (el.tagName === 'A' && el.hasAttribute('href')) {
+                anchors.push([el.href, el.textContent || '']);
+            }
+            if (el.shadowRoot) hosts.push(el.shadowRoot);
+        }
+        for (const sr of hosts) collectFrom(sr);
+    }
+    collectFrom(document);
+    return anchors;
+}
+"""
+
+
 async def deep_collect_anchors(page):
     """
     Fallback: coleta, via JS, todos os links <a href> da página,
     inclusive dentro de Shadow DOM.
     """
-    js = """
-    () => {
-        const anchors = [];
-        function collectFrom(root) {
-            const as = root.querySelectorAll('a[href]');
-            for (const a of as) {
-                anchors.push([a.href, a.textContent || '']);
-            }
-            if (root.shadowRoot) {
-                collectFrom(root.shadowRoot);
-            }
-            const shadowHosts = root.querySelectorAll('*');
-            for (const el of shadowHosts) {
-                if (el.shadowRoot) collectFrom(el.shadowRoot);
-            }
-        }
-        collectFrom(document);
-        return anchors;
-    }
-    """
     try:
-        return await page.evaluate(js)
+        return await page.evaluate(_JS_DEEP_ANCHORS)
     except Exception:
         return []
 
@@ -1066,33 +1380,35 @@ async def wait_results(page, timeout_ms=20000):
     Aguarda até que a página de resultados carregue:
     - Algum link típico de resultado (a.resultado-item-titulo, /web/dou/-/, etc.), ou
     - Uma mensagem de 'Nenhum resultado'.
+
+    As esperas correm em paralelo (locator.wait_for) e a primeira que casar
+    encerra as demais; se nenhuma casar até o timeout, apenas retorna.
     """
-    loc_none = page.get_by_text("Nenhum resultado", exact=False)
-    loc_candidates = [
+    locators = [
         page.locator("a.resultado-item-titulo"),
         page.locator("a[href*='/web/dou/-/']"),
         page.locator("a[href*='/materia/']"),
+        page.get_by_text("Nenhum resultado", exact=False),
     ]
-    deadline = datetime.now() + timedelta(milliseconds=timeout_ms)
-    while datetime.now() < deadline:
-        try:
-            if await loc_none.count() > 0:
-                return
-        except Exception:
-            pass
-        for loc in loc_candidates:
-            try:
-                if await loc.count() > 0:
-                    return
-            except Exception:
-                continue
-        await page.wait_for_timeout(500)
-    return
+    tasks = [
+        asyncio.create_task(loc.first.wait_for(state="attached", timeout=timeout_ms))
+        for loc in locators
+    ]
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(not t.cancelled() and t.exception() is None for t in done):
+                break
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
-def compile_accept_patterns(cfg: dict):
+@functools.lru_cache(maxsize=None)
+def _compile_patterns(pats: tuple) -> list:
     """Compila as expressões regulares de URLs aceitáveis (filters.accept_url_patterns)."""
-    pats = cfg.get("filters", {}).get("accept_url_patterns", [])
     compiled = []
     for p in pats:
         try:
@@ -1102,54 +1418,44 @@ def compile_accept_patterns(cfg: dict):
     return compiled
 
 
-def should_reject_url(url: str, cfg: dict) -> bool:
-    """Verifica se uma URL deve ser rejeitada com base em substrings (filters.reject_url_substrings)."""
-    rej = cfg.get("filters", {}).get("reject_url_substrings", [])
-    u = url.lower()
-    for s in rej:
-        if s.lower() in u:
-            return True
-    return False
+# Listas de `filters` que entram nos filtros preparados, na ordem de _prepare_filters
+_FILTER_LISTS = (
+    "reject_url_substrings",
+    "reject_title_substrings",
+    "title_keywords",
+    "orgao_keywords",
+    "accept_url_patterns",
+)
 
-def should_reject_title(title: str, cfg: dict) -> bool:
-    """
-    Rejeita resultados cujo TÍTULO contenha alguma substring listada em:
-    filters.reject_title_substrings (config.yml)
 
-    Comparação case-insensitive e sem espaços duplicados.
+def prepare_filters(cfg: dict) -> dict:
     """
-    rejects = (cfg.get("filters") or {}).get("reject_title_substrings") or []
-    if not rejects:
-        return False
-
-    t = (title or "").strip()
-    if not t:
-        return False
-
-    t_norm = re.sub(r"\s+", " ", t).lower()
+    Filtros de `filters` do config.yml já preparados: listas normalizadas e
+    compiladas em alternações (ver _substring_pattern). Usado pela listagem
+    (collect_links_from_listing) e pelo filtro de órgão (orgao_allowed).
 
-    for s in rejects:
-        if not s:
-            continue
-        s_norm = re.sub(r"\s+", " ", str(s)).lower().strip()
-        if s_norm and s_norm in t_norm:
-            return True
+    Cacheado pelas listas de origem (como _compile_patterns): a preparação
+    roda uma vez por configuração e uma config alterada gera filtros novos.
+    """
+    filters_cfg = cfg.get("filters") or {}
+    return _prepare_filters(tuple(tuple(filters_cfg.get(k) or ()) for k in _FILTER_LISTS))
 
-    return False
 
-def title_allowed(title: str, cfg: dict) -> bool:
-    """
-    Caso haja palavras-chave de título configuradas, só aceita resultados
-    cujo título contenha pelo menos uma delas (case-insensitive).
-    """
-    kws = cfg.get("filters", {}).get("title_keywords")
-    if not kws:
-        return True
-    t = (title or "").upper()
-    for kw in kws:
-        if (kw or "").upper() in t:
-            return True
-    return False
+@functools.lru_cache(maxsize=8)
+def _prepare_filters(lists: tuple) -> dict:
+    reject_urls, reject_titles, title_kws, orgao_kws, accept = lists
+    return {
+        "reject_url": _substring_pattern(tuple(str(s).lower() for s in reject_urls)),
+        "reject_title": _substring_pattern(tuple(
+            n for n in (_RE_WS.sub(" ", str(s)).lower().strip() for s in reject_titles if s)
+            if n
+        )),
+        "title_kw": _substring_pattern(tuple((kw or "").upper() for kw in title_kws)),
+        # orgao_on: há orgao_keywords configuradas (mesmo que todas vazias)
+        "orgao_on": bool(orgao_kws),
+        "orgao_kw": _substring_pattern(tuple(normalize(kw) for kw in orgao_kws if kw)),
+        "accept": _compile_patterns(accept),
+    }
 
 
 def orgao_allowed(orgao: str | None, cfg: dict) -> bool:
@@ -1161,19 +1467,27 @@ def orgao_allowed(orgao: str | None, cfg: dict) -> bool:
       - o órgão da matéria contiver pelo menos uma das palavras-chave
         configuradas (comparação com normalização).
     """
-    kws = cfg.get("filters", {}).get("orgao_keywords")
-    if not kws:
+    prepared = prepare_filters(cfg)
+    if not prepared["orgao_on"]:
         return True
     o = normalize(orgao or "")
     if not o:
         # Se não conseguimos identificar o órgão, preferimos manter o item.
         return True
-    for kw in kws:
-        if not kw:
-            continue
-        if normalize(kw) in o:
-            return True
-    return False
+    pat = prepared["orgao_kw"]
+    return pat is not None and pat.search(o) is not None
+
+
+@functools.lru_cache(maxsize=None)
+def _substring_pattern(subs: tuple) -> re.Pattern | None:
+    """
+    Regex equivalente a `any(s in texto for s in subs)`: alternação dos
+    trechos escapados, varrida de uma vez pelo motor de regex.
+    Devolve None para lista vazia (filtro desligado).
+    """
+    if not subs:
+        return None
+    return re.compile("|".join(map(re.escape, subs)))
 
 
 async def collect_links_from_listing(page, cfg: dict, broad: bool = True) -> list[dict]:
@@ -1184,7 +1498,13 @@ async def collect_links_from_listing(page, cfg: dict, broad: bool = True) -> lis
     """
     links = {}
     discards = {"menu_like": 0, "rejected_url": 0, "rejected_title": 0, "title_keyword": 0, "pattern_miss": 0}
-    accept_pats = compile_accept_patterns(cfg)
+    # Filtros preparados uma vez por execução (prepare_filters); filtros sem
+    # listas configuradas são pulados por completo.
+    filters = prepare_filters(cfg)
+    accept_pats = filters["accept"]
+    reject_urls = filters["reject_url"]
+    reject_titles = filters["reject_title"]
+    title_kws = filters["title_kw"]
 
     async def add_candidate(href, text, reason="primary"):
         if not href:
@@ -1193,14 +1513,16 @@ async def collect_links_from_listing(page, cfg: dict, broad: bool = True) -> lis
         if looks_like_menu(text):
             discards["menu_like"] += 1
             return
-        if should_reject_url(url, cfg):
+        if reject_urls and reject_urls.search(url.lower()):
             discards["rejected_url"] += 1
             return
         # ✅ Blacklist de título (veto absoluto)
-        if should_reject_title(text, cfg):
-            discards["rejected_title"] += 1
-            return
-        if not title_allowed(text, cfg):
+        if reject_titles and text and text.strip():
+            t_norm = _RE_WS.sub(" ", text.strip()).lower()
+            if reject_titles.search(t_norm):
+                discards["rejected_title"] += 1
+                return
+        if title_kws and not title_kws.search((text or "").upper()):
             discards["title_keyword"] += 1
             return
         if accept_pats:
@@ -1215,17 +1537,18 @@ async def collect_links_from_listing(page, cfg: dict, broad: bool = True) -> lis
         "a[href*='/web/dou/-/']",
         "a[href*='/materia/']",
     ]
-    for sel in selectors:
-        try:
-            loc = page.locator(sel)
-            count = await loc.count()
-            for i in range(count):
-                el = loc.nth(i)
-                href = await el.get_attribute("href")
-                text = (await el.text_content()) or ""
-                await add_candidate(href, text, reason=f"sel:{sel}")
-        except Exception:
-            continue
+    # Um único evaluate devolve [href, texto] de todos os seletores, na ordem
+    # seletor → documento (em vez de get_attribute/text_content por link).
+    try:
+        pairs = await page.evaluate(
+            """(sels) => sels.flatMap(s => Array.from(document.querySelectorAll(s),
+                a => [a.getAttribute('href'), a.textContent || '']))""",
+            selectors,
+        )
+    except Exception:
+        pairs = []
+    for href, text in pairs:
+        await add_candidate(href, text, reason="primary")
 
     if not links and broad:
         for href, text in await deep_collect_anchors(page):
@@ -1236,25 +1559,40 @@ async def collect_links_from_listing(page, cfg: dict, broad: bool = True) -> lis
     return items
 
 
+_RE_MATERIA_ID = re.compile(r"/-(?:[^/]+/)*(\d{6,})/?$")
+
+
 def extract_materia_id(url: str) -> str | None:
     """Tenta extrair um ID numérico longo da URL da matéria, quando existe."""
-    m = re.search(r"/-(?:[^/]+/)*(\d{6,})/?$", url)
+    m = _RE_MATERIA_ID.search(url)
     return m.group(1) if m else None
 
 
-async def resolve_to_materia(page, url: str) -> str:
+def is_materia_url(url: str) -> bool:
+    """Indica se a URL já é de uma página de matéria do DOU (/web/dou/-/ ou /materia/-/)."""
+    return "/web/dou/-/" in url or "/materia/-/" in url
+
+
+async def resolve_to_materia(page, url: str) -> tuple[str, bool]:
     """
     Garante que a URL final a ser usada seja de uma página de matéria do DOU
-    (contendo /web/dou/-/ ou /materia/-/). Se a URL não for de matéria,
-    abre a página e procura dentro dela um link de matéria para seguir.
+    (ver is_materia_url). Se a URL não for de matéria, abre a página e
+    procura dentro dela um link de matéria para seguir.
+
+    Só é necessária nos casos de borda: a listagem quase sempre já devolve
+    URLs de matéria, e o enrich_listing_item nem a chama nesses casos.
+
+    Devolve (url_final, ja_carregada): ja_carregada indica que a aba já está
+    em url_final (abriu a URL e não achou link para seguir), dispensando
+    um novo goto.
     """
-    if "/web/dou/-/" in url or "/materia/-/" in url:
-        return url
+    if is_materia_url(url):
+        return url, False
 
     try:
         await page.goto(url, wait_until="domcontentloaded", timeout=45000)
     except Exception:
-        return url
+        return url, False
 
     sel = "a[href*='/web/dou/-/'], a[href*='/materia/']"
     try:
@@ -1262,10 +1600,34 @@ async def resolve_to_materia(page, url: str) -> str:
         if await loc.count() > 0:
             href = await loc.first.get_attribute("href")
             if href:
-                return absolutize(href)
+                return absolutize(href), False
     except Exception:
         pass
-    return url
+    return url, True
+
+
+# Links de resultado (os mesmos seletores de collect_links_from_listing)
+_RESULT_ANCHORS = "a.resultado-item-titulo, a[href*='/web/dou/-/'], a[href*='/materia/']"
+
+# Rótulos do botão de próxima página, em ordem de preferência. O JS só
+# considera links/botões visíveis e habilitados (como o locator.click() fazia)
+# e clica no primeiro cujo texto contenha o rótulo (sem diferenciar caixa);
+# rótulos de um caractere (», >) exigem o texto exato, senão qualquer
+# controle com ">" no texto casaria.
+_NEXT_LABELS = ["Próximo", "Proximo", "»", ">"]
+_JS_CLICK_NEXT = """
+(labels) => {
+    const els = Array.from(document.querySelectorAll("a, button, [role='button']")).filter(e =>
+        e.offsetParent !== null && !e.disabled && e.getAttribute("aria-disabled") !== "true");
+    const texts = els.map(e => (e.textContent || "").trim().toLowerCase());
+    for (const lbl of labels) {
+        const l = lbl.toLowerCase();
+        const i = texts.findIndex(t => l.length === 1 ? t === l : t.includes(l));
+        if (i >= 0) { els[i].click(); return true; }
+    }
+    return false;
+}
+"""
 
 
 async def collect_paginated_results(page, cfg: dict, broad: bool, max_pages: int = 5) -> list[dict]:
@@ -1282,41 +1644,44 @@ async def collect_paginated_results(page, cfg: dict, broad: bool, max_pages: int
         items = await collect_links_from_listing(page, cfg, broad=broad)
         if not items:
             break
-        added = 0
-        for it in items:
-            u = it.get("url")
-            if u and u not in seen_urls:
-                seen_urls.add(u)
-                all_items.append(it)
-                added += 1
+        # URLs já são únicas dentro de uma página (dict em collect_links_from_listing)
+        new = [it for it in items if it.get("url") and it["url"] not in seen_urls]
+        seen_urls.update(it["url"] for it in new)
+        all_items.extend(new)
+        added = len(new)
         print(f"[DEBUG] Página {page_idx+1}: {len(items)} itens, {added} novos (total acumulado: {len(all_items)}).", flush=True)
+        if not added:
+            # Página sem links novos: a paginação não avançou (ou repetiu)
+            break
 
-        # Tenta avançar para a próxima página
-        next_clicked = False
-        for txt in ["Próximo", "Proximo", "»", ">"]:
-            try:
-                btn = page.get_by_text(txt, exact=False)
-                if await btn.count() > 0:
-                    await btn.first.click(timeout=1500)
-                    next_clicked = True
-                    break
-            except Exception:
-                continue
+        # Tenta avançar para a próxima página (busca + clique num só evaluate)
+        try:
+            next_clicked = await page.evaluate(_JS_CLICK_NEXT, _NEXT_LABELS)
+        except Exception:
+            next_clicked = False
 
         if not next_clicked:
             # Fallback: scroll para ver se aparecem mais itens
             try:
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                await page.wait_for_timeout(1000)
+                n_before = await page.evaluate(
+                    "(sel) => { window.scrollTo(0, document.body.scrollHeight);"
+                    " return document.querySelectorAll(sel).length; }",
+                    _RESULT_ANCHORS,
+                )
+                # Espera os novos links aparecerem (até 1s), em vez de 1s fixo
+                try:
+                    await page.wait_for_function(
+                        "([sel, n]) => document.querySelectorAll(sel).length > n",
+                        arg=[_RESULT_ANCHORS, n_before],
+                        timeout=1000,
+                    )
+                except Exception:
+                    pass
                 more = await collect_links_from_listing(page, cfg, broad=False)
                 print(f"[DEBUG] Fallback scroll infinito: {len(more) if more else 0} novos itens.", flush=True)
                 if not more:
                     break
-                for it in more:
-                    u = it.get("url")
-                    if u and u not in seen_urls:
-                        seen_urls.add(u)
-                        all_items.append(it)
+                all_items.extend(it for it in more if it.get("url") and it["url"] not in seen_urls)
                 break
             except Exception:
                 break
@@ -1330,7 +1695,101 @@ async def collect_paginated_results(page, cfg: dict, broad: bool, max_pages: int
 
     return all_items
 
-def extract_clean_text(soup: BeautifulSoup, max_chars: int = 4000) -> str:
+# ---------------------------------------------------------------------------
+# Parse de HTML (lxml)
+# ---------------------------------------------------------------------------
+
+def _xp_class(cls: str, tag: str = "*") -> str:
+    """XPath equivalente ao seletor CSS `tag.cls` (classe exata, não substring)."""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+# Parser reaproveitado entre páginas, um por thread (o lxml serializa o parse
+# num mesmo objeto parser, e o parse roda no pool de CPU); comentários nem
+# entram na árvore.
+_parser_local = threading.local()
+
+
+def _html_parser() -> lxml.html.HTMLParser:
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = lxml.html.HTMLParser(remove_comments=True)
+    return parser
+
+
+def parse_html(html_text: str):
+    """
+    Faz o parse do HTML direto com lxml.html (libxml2), sem a árvore-espelho
+    em Python que o BeautifulSoup monta por cima do mesmo parser.
+
+    <script>/<style> saem da árvore (mantendo o texto que vem depois deles)
+    para que node_text() devolva o mesmo texto que o get_text() do
+    BeautifulSoup devolvia.
+    """
+    parser = _html_parser()
+    try:
+        root = lxml.html.fromstring(html_text, parser=parser)
+    except ValueError:
+        # string com declaração de encoding (<?xml ...?>): lxml exige bytes
+        root = lxml.html.fromstring(html_text.encode("utf-8"), parser=parser)
+    lxml.etree.strip_elements(root, "script", "style", with_tail=False)
+    return root
+
+
+def node_text(node, sep: str = " ") -> str:
+    """Texto de um nó, equivalente ao get_text(sep, strip=True) do BeautifulSoup."""
+    if node is None:
+        return ""
+    return sep.join(t.strip() for t in node.itertext() if t.strip())
+
+
+def _first(node, xpath: str):
+    """Primeiro resultado de um XPath (ou None)."""
+    found = node.xpath(xpath)
+    return found[0] if found else None
+
+
+# Pool de threads para o parse/extração (CPU) fora do event loop. O libxml2
+# solta o GIL durante o parse, então vários enrich podem se sobrepor.
+_cpu_pool: ThreadPoolExecutor | None = None
+
+
+async def run_in_cpu_pool(fn, *args):
+    """Executa fn(*args) no pool de CPU sem bloquear o event loop."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="parse")
+    return await asyncio.get_running_loop().run_in_executor(_cpu_pool, fn, *args)
+
+
+def close_cpu_pool() -> None:
+    """Encerra o pool de CPU (se tiver sido criado)."""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+
+
+# Trechos que marcam parágrafos de ruído do portal (casados sem diferenciar caixa).
+_NOISE_SNIPPETS = (
+    "clique aqui",
+    "acesse o site",
+    "voltar para a página",
+    "reportar erro",
+    "menu",
+    "assinatura eletrônica",
+    "verificação de autenticidade",
+    "diário oficial da união",
+    "your ip",
+    "request id",
+    "status code",
+    "edge location",
+    "pesquisa aproximada",
+)
+_RE_NOISE = re.compile("|".join(map(re.escape, _NOISE_SNIPPETS)), re.IGNORECASE)
+
+
+def extract_clean_text(root, max_chars: int = 4000) -> str:
     """
     Extrai o texto principal da matéria do DOU de forma cirúrgica,
     priorizando o conteúdo normativo real para uso pela IA.
@@ -1343,48 +1802,33 @@ def extract_clean_text(soup: BeautifulSoup, max_chars: int = 4000) -> str:
     - devolve texto contínuo e limpo.
     """
 
-    if not soup:
+    if root is None:
         return ""
 
     # 1) Container principal do texto do DOU
-    container = soup.select_one("div.texto-dou body") or soup.select_one("div.texto-dou")
-    if not container:
+    container = _first(root, "//" + _xp_class("texto-dou", "div"))
+    if container is None:
         # fallback seguro
-        container = soup.select_one("div#materia") or soup.body
-        if not container:
+        container = _first(root, "//div[@id='materia']")
+        if container is None:
+            container = _first(root, "//body")
+        if container is None:
             return ""
 
     paragraphs = []
-    for p in container.find_all("p"):
-        classes = p.get("class") or []
+    for p in container.iter("p"):
+        classes = (p.get("class") or "").split()
 
         # ignora o título repetido
         if "identifica" in classes:
             continue
 
-        text = p.get_text(" ", strip=True)
+        text = node_text(p)
         if not text:
             continue
 
-        low = text.lower()
-
         # ruídos típicos do portal
-        noise_snippets = [
-            "clique aqui",
-            "acesse o site",
-            "voltar para a página",
-            "reportar erro",
-            "menu",
-            "assinatura eletrônica",
-            "verificação de autenticidade",
-            "diário oficial da união",
-            "your ip",
-            "request id",
-            "status code",
-            "edge location",
-            "pesquisa aproximada",
-        ]
-        if any(n in low for n in noise_snippets):
+        if _RE_NOISE.search(text):
             continue
 
         paragraphs.append(text)
@@ -1394,7 +1838,7 @@ def extract_clean_text(soup: BeautifulSoup, max_chars: int = 4000) -> str:
 
     # 2) Junta tudo em um texto contínuo
     text = " ".join(paragraphs)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _RE_WS.sub(" ", text).strip()
 
     # 3) Limite de tamanho (proteção para IA)
     if max_chars and len(text) > max_chars:
@@ -1405,15 +1849,37 @@ def extract_clean_text(soup: BeautifulSoup, max_chars: int = 4000) -> str:
 
     return text
 
+def _raw_is_plausible(item: dict) -> bool:
+    """
+    Pré-checagem barata (só URL) antes de abrir a página da matéria.
+    Descarta links que não são http(s) da Imprensa Nacional (ex.: javascript:,
+    mailto:, sites externos capturados pela varredura de âncoras), evitando
+    navegação e parse de HTML para itens que seriam inúteis.
+    """
+    try:
+        parts = urlsplit(item.get("url") or "")
+    except ValueError:
+        return False
+    if parts.scheme not in ("http", "https"):
+        return False
+    host = (parts.hostname or "").lower()
+    return host == "in.gov.br" or host.endswith(".in.gov.br")
+
+
 async def enrich_listing_item(page, item: dict) -> dict:
     """
     Abre a página da matéria para extrair metadados adicionais:
     órgão, tipo de ato (Portaria, Decreto, etc.), número e data de publicação.
     Também devolve um 'texto_bruto' para uso pela IA.
     """
-    final_url = await resolve_to_materia(page, item["url"])
+    url = item["url"]
+    if is_materia_url(url):
+        final_url, loaded = url, False
+    else:
+        final_url, loaded = await resolve_to_materia(page, url)
     try:
-        await page.goto(final_url, wait_until="domcontentloaded", timeout=45000)
+        if not loaded:
+            await page.goto(final_url, wait_until="domcontentloaded", timeout=45000)
     except Exception:
         # fallback: sem texto bruto
         return {
@@ -1422,60 +1888,94 @@ async def enrich_listing_item(page, item: dict) -> dict:
             "orgao": None,
             "tipo": None,
             "numero": None,
-            "data": datetime.now().strftime("%d/%m/%Y"),
+            "data": datetime.now(BR_TZ).strftime("%d/%m/%Y"),
             "texto_bruto": "",
         }
 
     html_page = await page.content()
-    soup = BeautifulSoup(html_page, "lxml")
+    # parse + heurísticas são só CPU: rodam no pool para não travar o loop
+    return await run_in_cpu_pool(extract_materia_fields, html_page, item, final_url)
+
+
+# Heurísticas de metadados da página da matéria
+_RE_ORGAO_LABEL = re.compile(r"Órg[aã]o:\s*([^\n]+)", re.I)
+_RE_TIPO_ATO = re.compile(
+    r"\b(Portaria|Instru[cç][aã]o Normativa|Decreto|Lei|Resolu[cç][aã]o|Despacho|Ato Declarat[óo]rio|Solu[cç][aã]o de Consulta)\b",
+    re.I,
+)
+# Rótulos da data de publicação, em ordem de preferência (um grupo por rótulo):
+# uma só varredura do texto; vence o rótulo de menor grupo, não o mais à esquerda
+_RE_DATA_PUB = re.compile(
+    r"Publicado em[:\s]+(\d{2}/\d{2}/\d{4})"
+    r"|Edi[cç][aã]o de[:\s]+(\d{2}/\d{2}/\d{4})"
+    r"|Data de publica[cç][aã]o[:\s]+(\d{2}/\d{2}/\d{4})",
+    re.I,
+)
 
-    titulo = item.get("titulo") or (soup.title.get_text(strip=True) if soup.title else "")
+
+# Classes do bloco de órgão, em ordem de preferência. Um único XPath casa
+# qualquer uma delas (uma só passada pela árvore); a preferência é aplicada
+# depois sobre os poucos nós encontrados.
+_ORGAO_CLASSES = ("orgao", "row-orgao", "info-orgao")
+_XP_ORGAO = "//*[" + " or ".join(
+    f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')" for cls in _ORGAO_CLASSES
+) + "]"
+
+
+def extract_materia_fields(html_page: str, item: dict, final_url: str) -> dict:
+    """
+    Parte síncrona do enrich_listing_item: faz o parse do HTML da matéria e
+    extrai título, órgão, tipo, número, data, resumo editorial e texto limpo.
+    """
+    root = parse_html(html_page)
+
+    titulo = item.get("titulo") or node_text(root.find(".//title"), "")
+
+    # texto do documento inteiro: uma única passada pela árvore, reaproveitada
+    # pelo fallback do órgão e pelas heurísticas de tipo/número/data
+    raw_all = node_text(root, "\n")
 
     # órgão (opcional)
     orgao = None
-    for sel in ['.orgao', '.row-orgao', '.info-orgao', 'section.orgao', 'header .orgao']:
-        el = soup.select_one(sel)
-        if el:
-            orgao = el.get_text(" ", strip=True)
-            break
+    found = root.xpath(_XP_ORGAO)
+    if found:
+        # a ordem de _ORGAO_CLASSES decide; entre iguais, o primeiro no documento
+        el = min(found, key=lambda e: min(
+            _ORGAO_CLASSES.index(c) for c in e.get("class").split() if c in _ORGAO_CLASSES
+        ))
+        orgao = node_text(el)
     if not orgao:
-        m = re.search(r"Órg[aã]o:\s*([^\n]+)", soup.get_text("\n", strip=True), re.I)
+        m = _RE_ORGAO_LABEL.search(raw_all)
         if m:
             orgao = m.group(1).strip()
 
     # texto bruto principal para heurísticas (tudo em uma linha)
-    raw_all = soup.get_text("\n", strip=True)
-    head_txt = raw_all.replace("\n", " ")[:4000]
+    head_txt = raw_all[:4000].replace("\n", " ")
 
     # tipo/número (heurística)
-    m_tipo = re.search(
-        r"\b(Portaria|Instru[cç][aã]o Normativa|Decreto|Lei|Resolu[cç][aã]o|Despacho|Ato Declarat[óo]rio|Solu[cç][aã]o de Consulta)\b",
-        head_txt,
-        re.I,
-    )
+    m_tipo = _RE_TIPO_ATO.search(head_txt)
     tipo = m_tipo.group(1).upper() if m_tipo else None
 
-    m_num = re.search(r"\bN[ºo\.]?\s*([\d\.]+(?:/\d{4})?)", head_txt, re.I)
+    m_num = _RE_NUMERO_ATO.search(head_txt)
     numero = m_num.group(1) if m_num else None
 
     # data de publicação
     data_pub = None
-    for pat in [
-        r"Publicado em[:\s]+(\d{2}/\d{2}/\d{4})",
-        r"Edi[cç][aã]o de[:\s]+(\d{2}/\d{2}/\d{4})",
-        r"Data de publica[cç][aã]o[:\s]+(\d{2}/\d{2}/\d{4})",
-    ]:
-        m = re.search(pat, head_txt, re.I)
-        if m:
-            data_pub = m.group(1)
-            break
+    best = None
+    for m in _RE_DATA_PUB.finditer(head_txt):
+        if best is None or m.lastindex < best.lastindex:
+            best = m
+            if best.lastindex == 1:
+                break
+    if best is not None:
+        data_pub = best.group(best.lastindex)
     if not data_pub:
-        data_pub = datetime.now().strftime("%d/%m/%Y")
+        data_pub = datetime.now(BR_TZ).strftime("%d/%m/%Y")
 
     # resumo editorial (quando existir)
-    resumo_editorial = extract_editorial_summary(soup, max_chars=400)
+    resumo_editorial = extract_editorial_summary(root, max_chars=400)
     # texto limpo para IA (corpo da matéria, sem menus)
-    clean_text = extract_clean_text(soup)
+    clean_text = extract_clean_text(root)
     # limita para não explodir a IA
     clean_text = clean_text[:4000]
 
@@ -1494,13 +1994,16 @@ async def enrich_listing_item(page, item: dict) -> dict:
 # Extrai o resumo editorial do DOU
 #------------------------------------------------------------
 
-def extract_editorial_summary(html_or_soup, max_chars: int = 320) -> str:
+_RE_ASSUNTO_PREFIX = re.compile(r"^\s*assunto:\s*", re.I)
+
+
+def extract_editorial_summary(html_or_root, max_chars: int = 320) -> str:
     """
     Extrai o "texto-síntese editorial" do DOU pegando o PRIMEIRO <p> útil
     logo após <p class="identifica">...</p>.
 
     Aceita:
-      - BeautifulSoup (soup) já parseado, OU
+      - árvore lxml já parseada (parse_html), OU
       - string HTML
 
     Regras:
@@ -1511,7 +2014,7 @@ def extract_editorial_summary(html_or_soup, max_chars: int = 320) -> str:
       - corta em max_chars e colapsa espaços.
     """
     try:
-        soup = html_or_soup if hasattr(html_or_soup, "select_one") else BeautifulSoup(html_or_soup, "lxml")
+        root = parse_html(html_or_root) if isinstance(html_or_root, (str, bytes)) else html_or_root
     except Exception:
         return ""
 
@@ -1519,9 +2022,9 @@ def extract_editorial_summary(html_or_soup, max_chars: int = 320) -> str:
         s = (s or "").strip()
         if not s:
             return ""
-        s = re.sub(r"\s+", " ", s).strip()
+        s = _RE_WS.sub(" ", s).strip()
         # tira "Assunto:" (você comentou que não é necessário no e-mail)
-        s = re.sub(r"(?i)^\s*assunto:\s*", "", s).strip()
+        s = _RE_ASSUNTO_PREFIX.sub("", s).strip()
         return s
 
     def _truncate(s: str) -> str:
@@ -1535,25 +2038,29 @@ def extract_editorial_summary(html_or_soup, max_chars: int = 320) -> str:
         return s
 
     # 1) Preferir o container do corpo da matéria
-    container = soup.select_one("div.texto-dou") or soup
+    container = _first(root, "//" + _xp_class("texto-dou", "div"))
+    if container is None:
+        container = root
 
     # 2) Achar o <p class="identifica">
-    ident = container.find("p", class_="identifica") or soup.find("p", class_="identifica")
-    if not ident:
+    ident = _first(container, ".//" + _xp_class("identifica", "p"))
+    if ident is None:
+        ident = _first(root, "//" + _xp_class("identifica", "p"))
+    if ident is None:
         return ""
 
     # 3) Pegar o primeiro <p> depois do identifica (na ordem do HTML)
-    for nxt in ident.find_all_next("p", limit=30):
+    for nxt in ident.xpath("following::p[position() <= 30]"):
         # se achar outro identifica, para (mudou de bloco)
-        if "identifica" in (nxt.get("class") or []):
+        if "identifica" in (nxt.get("class") or "").split():
             break
 
-        txt = _clean(nxt.get_text(" ", strip=True))
+        txt = _clean(node_text(nxt))
         if not txt:
             continue
 
         # evita devolver o título repetido (às vezes colado)
-        ident_txt = _clean(ident.get_text(" ", strip=True))
+        ident_txt = _clean(node_text(ident))
         if ident_txt and txt == ident_txt:
             continue
 
@@ -1573,9 +2080,10 @@ def _parse_br_date(s: str) -> datetime:
         return datetime(1970, 1, 1)
 
 
+@functools.lru_cache(maxsize=4096)
 def build_seen_keys(url: str):
     """
-    A partir da URL da matéria, gera duas chaves possíveis para o seen.json:
+    A partir da URL da matéria, gera duas chaves possíveis para o seen.txt:
     - 'url:<url>'  (sempre)
     - 'id:<id>'    (se for possível extrair o ID numérico).
     """
@@ -1585,6 +2093,21 @@ def build_seen_keys(url: str):
     return url_key, id_key
 
 
+def is_seen(url: str, seen: set) -> bool:
+    """
+    Indica se a matéria já foi enviada: testa as chaves de build_seen_keys
+    contra o set `seen` (lookup O(1)). URLs cruas do histórico antigo já
+    chegam prefixadas por load_seen.
+    """
+    url_key, id_key = build_seen_keys(url)
+    return (url_key in seen) or bool(id_key and id_key in seen)
+
+
+def filter_unseen(items: list[dict], seen: set) -> list[dict]:
+    """Devolve apenas os itens ainda não enviados (ver is_seen)."""
+    return [it for it in items if not is_seen(it["url"], seen)]
+
+
 # ---------------------------------------------------------------------------
 # Query principal (busca no DOU)
 # ---------------------------------------------------------------------------
@@ -1607,10 +2130,21 @@ async def goto_with_retry(page, url: str, *, attempts: int = 3, timeout_ms: int
             await page.wait_for_timeout(800 * attempt)
 
 
-async def query_dou(page, cfg: dict, phrases: list[str]) -> list[dict]:
+# Períodos lógicos que significam "edição do dia"
+_PERIODS_TODAY = frozenset({"today", "day", "dia", "hoje", "edicao", "edição"})
+
+# Caracteres trocados por "_" no nome dos HTMLs de debug (artifacts/)
+_RE_UNSAFE_FILENAME = re.compile(r"[^0-9a-zA-Z_-]+")
+
+
+async def query_dou(page, cfg: dict, phrases: list[str]):
     """
     Executa a busca principal no DOU combinando frases e seções.
 
+    É um gerador assíncrono: cada item único ({"url", "titulo"}) é entregue
+    assim que sua listagem termina, para que o enriquecimento comece antes
+    do fim de todas as buscas.
+
     Define:
     - período lógico (today/week/month/any), com override via PERIOD_OVERRIDE;
     - days_window (para label);
@@ -1625,7 +2159,7 @@ async def query_dou(page, cfg: dict, phrases: list[str]) -> list[dict]:
     ).strip().lower()
 
     # 2) "days" é só informativo pro texto do e-mail
-    if period in {"today", "day", "dia", "hoje", "edicao", "edição"}:
+    if period in _PERIODS_TODAY:
         days = 1
     elif period in {"week", "semana"}:
         days = 7
@@ -1669,7 +2203,8 @@ async def query_dou(page, cfg: dict, phrases: list[str]) -> list[dict]:
             ok = await goto_with_retry(page, direct_url, attempts=3, timeout_ms=25000)
             if not ok:
                 continue
-            await wait_results(page, timeout_ms=20000)
+            # goto usa domcontentloaded; a espera pelos resultados fica com
+            # collect_paginated_results (wait_results no início de cada página).
             items = await collect_paginated_results(page, cfg, broad=True, max_pages=max_pages)
 
             if not items:
@@ -1678,20 +2213,24 @@ async def query_dou(page, cfg: dict, phrases: list[str]) -> list[dict]:
                     content = await page.content()
                     artifacts_dir = ROOT / "artifacts"
                     artifacts_dir.mkdir(parents=True, exist_ok=True)
-                    safe_phrase = re.sub(r"[^0-9a-zA-Z_-]+", "_", normalize(phrase))[:40]
+                    safe_phrase = _RE_UNSAFE_FILENAME.sub("_", normalize(phrase))[:40]
                     fname = artifacts_dir / f"listing_direct_{sec}_{safe_phrase}.html"
-                    with open(fname, "w", encoding="utf-8") as f:
-                        f.write(content)
+                    # escrita em thread: não trava o loop (e as abas de enrich)
+                    await asyncio.to_thread(fname.write_text, content, encoding="utf-8")
                     print(f"[DEBUG] Nenhum item via URL direta; HTML salvo em {fname}", flush=True)
                 except Exception as e:
                     print(f"[WARN] Falha ao salvar HTML de debug: {e}", flush=True)
             else:
                 for it in items:
-                    all_results.add((it["url"], it.get("titulo") or ""))
+                    # Dedup pela URL normalizada: a mesma matéria com
+                    # ?utm_... ou host em outra caixa não é enriquecida duas vezes.
+                    url = normalize_url(it["url"])
+                    if url in all_results:
+                        continue
+                    all_results.add(url)
+                    yield {"url": url, "titulo": it.get("titulo") or ""}
 
-    listing = [{"url": u, "titulo": t} for (u, t) in all_results]
-    print(f"[DEBUG] query_dou -> {len(listing)} itens únicos (via URL direta).", flush=True)
-    return listing
+    print(f"[DEBUG] query_dou -> {len(all_results)} itens únicos (via URL direta).", flush=True)
 
 
 
@@ -1716,7 +2255,7 @@ class TimeMarks:
         delta = now - self.last
         total = now - self.t0
         self.last = now
-        ts = datetime.now(timezone(timedelta(hours=-3))).strftime("%H:%M:%S")
+        ts = datetime.now(BR_TZ).strftime("%H:%M:%S")
         print(f"[{self.label}] {ts} + {delta:6.2f}s | total {total:7.2f}s | {msg}", flush=True)
 
 
@@ -1727,15 +2266,16 @@ class TimeMarks:
 async def run() -> None:
     """
     Pipeline principal do robô:
-    - Carrega config.yml e o seen.json
+    - Carrega config.yml e o seen.txt
     - Abre navegador headless com Playwright
     - Executa a query no DOU
     - Enriquecimento de cada item (órgão, tipo, número, data, texto_bruto)
     - Filtra itens já vistos
     - Se período for 'today', mantém apenas a edição do dia
     - Filtro opcional por órgão
-    - (Opcional) Gera resumos com IA
-    - Ordena, envia e-mail e atualiza seen.json
+    - (Opcional) Gera resumos com IA, em lotes disparados já durante o
+      enriquecimento (a espera fica só para antes do e-mail)
+    - Ordena, envia e-mail e atualiza seen.txt
     """
     tm = TimeMarks('DOU')
     tm.mark('run() iniciou')
@@ -1746,10 +2286,79 @@ async def run() -> None:
 
     tm.mark('antes de load_seen()')
     seen = load_seen()
-    tm.mark('estado carregado (seen.json)')
+    tm.mark('estado carregado (seen.txt)')
     enrich = bool(cfg.get("search", {}).get("enrich_listing", True))
     phrases = cfg.get("search", {}).get("phrases", [])
 
+    # Filtros pós-enrich (edição do dia e órgão) como predicados: servem tanto
+    # para disparar a IA cedo quanto para a filtragem final. O período efetivo
+    # só é definido quando query_dou começa, por isso _date_ok lê o cfg.
+    today_br = datetime.now(BR_TZ).strftime("%d/%m/%Y")
+    filters = prepare_filters(cfg)
+
+    def _date_ok(r: dict) -> bool:
+        if cfg.get("search", {}).get("period_effective") not in _PERIODS_TODAY:
+            return True
+        return (r.get("data") or "").strip() == today_br
+
+    def _orgao_ok(r: dict) -> bool:
+        return orgao_allowed(r.get("orgao"), cfg)
+
+    # ---- IA: os resumos saem em lotes enquanto o enriquecimento continua ----
+    ai_cfg = (cfg.get("ai") or {}).get("summaries") or {}
+    ia_enabled = bool(ai_cfg.get("enabled"))
+    # Opcional (desligado por padrão): pula a IA quando há resumo editorial
+    # do próprio DOU. O e-mail prefere o resumo da IA, então ligar isto troca
+    # o texto exibido pelo editorial.
+    skip_editorial = bool(ai_cfg.get("skip_if_editorial", False))
+    ia_batch_size = max(1, int(ai_cfg.get("batch_size", 8)))
+    ia_sem = asyncio.Semaphore(max(1, int(ai_cfg.get("concurrency", 4))))
+    # Logs por item só montam seus argumentos se o nível INFO estiver ativo
+    log_info = logger.isEnabledFor(logging.INFO)
+    ia_buffer: list[str] = []
+    ia_tasks: list[tuple[list[str], asyncio.Task]] = []
+    # texto → itens que o compartilham: o mesmo ato listado sob URLs
+    # diferentes vai uma vez só para a IA e o resumo é aplicado a todos
+    ia_by_text: dict[str, list[dict]] = {}
+
+    def _flush_ia() -> None:
+        if ia_buffer:
+            batch = ia_buffer[:]
+            ia_buffer.clear()
+            # ia_sem é o único limitador: vale para todos os lotes do run()
+            task = asyncio.create_task(generate_summaries_ia_async(batch, cfg, ia_sem))
+            ia_tasks.append((batch, task))
+
+    def _queue_ia(r: dict) -> None:
+        """Se o item vai para o e-mail e precisa de resumo, entra no lote da IA."""
+        if r.get("resumo_ia"):
+            return
+        if skip_editorial and (r.get("resumo_editorial") or "").strip():
+            return
+        raw = (r.get("texto_bruto") or "").strip()
+        if not raw:
+            return
+        if is_seen(r["url"], seen) or not _date_ok(r) or not _orgao_ok(r):
+            return
+        if raw in ia_by_text:
+            ia_by_text[raw].append(r)  # texto idêntico já está na fila
+            return
+        ia_by_text[raw] = [r]
+
+        if log_info:
+            titulo_dbg = (r.get("titulo") or "")[:80]
+            logger.info("[IA] Gerando resumo para: %r", titulo_dbg)
+            # DEBUG: inspecionar o que está indo para a IA
+            logger.info(
+                "[IA-DEBUG] Texto_bruto (%s) [len=%d]: %.500r",
+                titulo_dbg,
+                len(raw),
+                raw[:300],
+            )
+        ia_buffer.append(raw)
+        if len(ia_buffer) >= ia_batch_size:
+            _flush_ia()
+
     tm.mark('antes de async_playwright()')
     async with async_playwright() as p:
         tm.mark('async_playwright() OK (contexto aberto)')
@@ -1764,24 +2373,88 @@ async def run() -> None:
                 "(KHTML, like Gecko) Chrome/130.0 Safari/537.36"
             ),
         )
+        # filtro de recursos registrado uma vez, para todas as abas do contexto
+        await context.route("**/*", _block_heavy_resources)
         tm.mark('new_context() OK')
         tm.mark('antes de new_page()')
         page = await context.new_page()
-        # Otimização: bloquear recursos pesados (imagens/fontes/css) para acelerar a listagem
-        async def _route_filter(route):
-            rtype = route.request.resource_type
-            if rtype in ("image", "media", "font", "stylesheet"):
-                await route.abort()
-            else:
-                await route.continue_()
-
-        await page.route("**/*", _route_filter)
         tm.mark('new_page() OK')
 
-        tm.mark('antes de query_dou() (busca/listagem)')
-        listing = await query_dou(page, cfg, phrases)
-        tm.mark('query_dou() finalizou')
-        if not listing:
+        # (ordem de chegada, item) — a ordem da listagem é restaurada no fim
+        enriched_seq: list[tuple[int, dict]] = []
+        # Data de fallback (sem enrich) calculada uma única vez, fora do laço
+        hoje_fallback = datetime.now(BR_TZ).strftime("%d/%m/%Y")
+        # Pool de abas para o enriquecimento, no mesmo browser/contexto da
+        # listagem: cada consumidor tem a sua e as navegações se sobrepõem
+        workers = max(1, int(cfg.get("search", {}).get("enrich_workers", 4))) if enrich else 1
+        enrich_pages = [await context.new_page() for _ in range(workers)] if enrich else [None]
+
+        # Busca (produtor) e enriquecimento (consumidores) rodam sobrepostos:
+        # cada item entra na fila assim que sai da listagem. A fila limitada
+        # segura a busca quando o enriquecimento fica para trás.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=ENRICH_QUEUE_SIZE)
+        found = 0
+        implausible = 0
+        already_seen = 0
+
+        async def _produce() -> None:
+            nonlocal found
+            try:
+                async for it in query_dou(page, cfg, phrases):
+                    found += 1
+                    await queue.put(it)
+            finally:
+                for _ in enrich_pages:
+                    await queue.put(None)  # sentinela (uma por consumidor): fim da busca
+            tm.mark('query_dou() finalizou')
+
+        seq = 0
+
+        async def _consume(enrich_page) -> None:
+            nonlocal implausible, already_seen, seq
+            while True:
+                it = await queue.get()
+                if it is None:
+                    break
+                if not _raw_is_plausible(it):
+                    implausible += 1
+                    continue
+                # Já enviado: nem abre a matéria (o filtro pós-enrich ainda
+                # cobre os casos em que resolve_to_materia troca a URL).
+                if is_seen(it["url"], seen):
+                    already_seen += 1
+                    continue
+                my_seq, seq = seq, seq + 1
+                if enrich:
+                    v = await enrich_listing_item(enrich_page, it)
+                else:
+                    v = {
+                        "url": it["url"],
+                        "titulo": it.get("titulo") or "(sem título)",
+                        "orgao": None,
+                        "tipo": None,
+                        "numero": None,
+                        "data": hoje_fallback,
+                        "texto_bruto": "",
+                    }
+                # chave de ordenação (data desc, título) calculada uma vez por item
+                v["_sort_key"] = (_parse_br_date(v.get("data")), v.get("titulo") or "")
+                enriched_seq.append((my_seq, v))
+                if ia_enabled:
+                    _queue_ia(v)
+
+        tm.mark('antes de query_dou() (busca/listagem + enrich)')
+        await asyncio.gather(_produce(), *(_consume(pg) for pg in enrich_pages))
+        _flush_ia()  # último lote (incompleto) da IA
+        enriched_seq.sort(key=itemgetter(0))
+        enriched = [v for _, v in enriched_seq]
+        tm.mark(f'fim da busca/enrich (itens={found})')
+        if implausible:
+            print(f"[DEBUG] {implausible} link(s) fora do DOU ignorado(s) antes do enrich.", flush=True)
+        if already_seen:
+            print(f"[DEBUG] {already_seen} link(s) já enviado(s) ignorado(s) antes do enrich.", flush=True)
+
+        if not found:
             print("Nenhuma publicação encontrada para os critérios configurados.")
             if str(os.getenv("FORCE_TEST_EMAIL", "")).lower() in {"1", "true", "yes"}:
                 test_item = {
@@ -1790,7 +2463,7 @@ async def run() -> None:
                     "orgao": None,
                     "tipo": "Aviso",
                     "numero": "",
-                    "data": datetime.now().strftime("%d/%m/%Y"),
+                    "data": datetime.now(BR_TZ).strftime("%d/%m/%Y"),
                     "texto_bruto": "",
                 }
                 send_email([test_item], cfg)
@@ -1799,83 +2472,41 @@ async def run() -> None:
             await browser.close()
             return
 
-        relevant = []
-        tm.mark(f'início do enrich (itens={len(listing)})')
-        for it in listing:
-            if enrich:
-                v = await enrich_listing_item(page, it)
-            else:
-                v = {
-                    "url": it["url"],
-                    "titulo": it.get("titulo") or "(sem título)",
-                    "orgao": None,
-                    "tipo": None,
-                    "numero": None,
-                    "data": datetime.now().strftime("%d/%m/%Y"),
-                    "texto_bruto": "",
-                }
-
-            key_url = v["url"]
-            url_key, id_key = build_seen_keys(key_url)
-
-            # Compatibilidade com histórico
-            if (key_url in seen) or (url_key in seen) or (id_key and id_key in seen):
-                continue
-
-            relevant.append(v)
+        # Filtra já enviados (seen.txt) pela URL final, pós-resolve
+        relevant = filter_unseen(enriched, seen)
 
         tm.mark(f'fim do enrich (relevant={len(relevant)})')
         await context.close()
         await browser.close()
 
     # ---- filtro EDIÇÃO DO DIA ----
-    period_eff = cfg.get("search", {}).get("period_effective")
-    if period_eff in {"today", "day", "dia", "hoje", "edicao", "edição"}:
-        today_br = datetime.now(timezone(timedelta(hours=-3))).strftime("%d/%m/%Y")
+    if cfg.get("search", {}).get("period_effective") in _PERIODS_TODAY:
         before = len(relevant)
-        relevant = [r for r in relevant if (r.get("data") or "").strip() == today_br]
+        relevant = [r for r in relevant if _date_ok(r)]
         print(f"[DEBUG] Filtro edição do dia {today_br}: {before} -> {len(relevant)} item(ns).", flush=True)
 
     # ---- filtro opcional por órgão ----
-    if cfg.get("filters", {}).get("orgao_keywords"):
+    if filters["orgao_on"]:
         antes = len(relevant)
-        relevant = [r for r in relevant if orgao_allowed(r.get("orgao"), cfg)]
+        relevant = [r for r in relevant if _orgao_ok(r)]
         print(f"[DEBUG] Filtro por órgão: {antes} -> {len(relevant)} item(ns) após aplicar orgao_keywords", flush=True)
 
     # ---- ordenar por data desc (e por título para estabilizar) ----
-    def _sort_key(r):
-        return (_parse_br_date(r.get("data")), (r.get("titulo") or ""))
-
-    relevant.sort(key=_sort_key, reverse=True)
-
-    # ---- IA: gerar resumos das matérias, se habilitado ----
-    ai_cfg = (cfg.get("ai") or {}).get("summaries") or {}
-    if ai_cfg.get("enabled"):
-        for r in relevant:
-            if r.get("resumo_ia"):
-                continue
-            raw = (r.get("texto_bruto") or "").strip()
-            if not raw:
+    relevant.sort(key=itemgetter("_sort_key"), reverse=True)
+
+    # ---- IA: recolhe os resumos disparados durante o enriquecimento ----
+    # (_queue_ia aplica os mesmos filtros acima, então só itens de `relevant`
+    # foram enviados; lotes de batch_size, até `concurrency` em paralelo)
+    if ia_tasks:
+        tm.mark(f"aguardando IA ({len(ia_tasks)} lote(s))")
+    for batch, task in ia_tasks:
+        for raw, resumo in zip(batch, await task):
+            if not resumo:
                 continue
-
-            titulo_dbg = (r.get("titulo") or "")[:80]
-            logger.info("[IA] Gerando resumo para: %r", titulo_dbg)
-            # DEBUG: inspecionar o que está indo para a IA
-            logger.info(
-                "[IA-DEBUG] Texto_bruto (%s) [len=%d]: %.500r",
-                titulo_dbg,
-                len(raw),
-                raw[:300],
-            )
-
-            resumo = generate_summary_ia(raw, cfg)
-            if resumo:
+            for r in ia_by_text[raw]:
                 r["resumo_ia"] = resumo
-                logger.info("[IA] Resumo aplicado em: %r", titulo_dbg)
-            # Pequena pausa para ser gentil com a API
-            time.sleep(1)
-
-
+                if log_info:
+                    logger.info("[IA] Resumo aplicado em: %r", (r.get("titulo") or "")[:80])
 
     # ---- envio e atualização do estado ----
     if relevant:
@@ -1883,17 +2514,18 @@ async def run() -> None:
         send_email(relevant, cfg)
         tm.mark("depois de send_email()")
 
+        new_keys: list[str] = []
         for r in relevant:
-            url_key, id_key = build_seen_keys(r["url"])
-            seen.add(url_key)
-            if id_key:
-                seen.add(id_key)
+            for key in build_seen_keys(r["url"]):
+                if key and key not in seen:
+                    seen.add(key)
+                    new_keys.append(key)
 
         tm.mark("antes de save_seen()")
-        save_seen(seen)
+        save_seen(seen, new_keys)
         tm.mark("depois de save_seen()")
 
-        print(f"{len(relevant)} item(ns) novos registrados no seen.json.", flush=True)
+        print(f"{len(relevant)} item(ns) novos registrados no seen.txt.", flush=True)
     else:
         print("Sem novidades para enviar.", flush=True)
 
@@ -1902,8 +2534,25 @@ async def run() -> None:
 # Ponto de entrada
 # ---------------------------------------------------------------------------
 
+def _install_uvloop() -> None:
+    """
+    Usa o loop do uvloop (mais rápido para I/O assíncrono) quando disponível.
+    Opcional: sem o pacote, ou no Windows, segue com o loop padrão do asyncio.
+    """
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+
+
 if __name__ == "__main__":
+    _install_uvloop()
     try:
         asyncio.run(run())
     except KeyboardInterrupt:
         sys.exit(130)
+    finally:
+        close_cpu_pool()